@@ -3,39 +3,52 @@ Configuration Management for NFL Playoff Predictor
 All constants, settings, and configurable parameters in one place
 """
 
+import functools
 import os
 from datetime import datetime
+from enum import IntEnum
+
+import numpy as np
 
 # =============================================================================
 # SEASON & DATA SETTINGS
 # =============================================================================
 
+@functools.lru_cache(maxsize=2)
+def _season_snapshot(day_ordinal):
+    """Season detection cached per calendar day (keyed by date ordinal)"""
+    date = datetime.fromordinal(day_ordinal)
+    year = date.year
+    month = date.month
+
+    if month <= 2:  # Jan-Feb: Playoffs
+        return year - 1, "Playoffs"
+    elif month <= 8:  # Mar-Aug: Offseason
+        return year - 1, "Offseason"
+    else:  # Sept-Dec: Regular Season
+        return year, "Regular Season"
+
+
 class SeasonConfig:
     """Season and data-related configuration"""
-    
+
     # Auto-detect current season based on date
     @staticmethod
     def get_current_season():
         """
         Auto-detect NFL season based on current date
-        
+
+        Cached per calendar day — callers inside loops don't re-run the
+        date math on every invocation.
+
         Returns:
             tuple: (season_year, phase)
-            
+
         Examples:
             January 2026 -> (2025, "Playoffs")
             September 2026 -> (2026, "Regular Season")
         """
-        now = datetime.now()
-        year = now.year
-        month = now.month
-        
-        if month <= 2:  # Jan-Feb: Playoffs
-            return year - 1, "Playoffs"
-        elif month <= 8:  # Mar-Aug: Offseason
-            return year - 1, "Offseason"
-        else:  # Sept-Dec: Regular Season
-            return year, "Regular Season"
+        return _season_snapshot(datetime.now().toordinal())
     
     # Data fetch settings
     CACHE_ENABLED = True
@@ -123,8 +136,24 @@ class BettingConfig:
     # American odds
     DEFAULT_ODDS = -110  # Standard juice
     
-    # Key numbers (most common margins)
-    KEY_NUMBERS = [3, 7, 10, 6, 4, 14]
+    # Key numbers (most common margins), pre-sorted for
+    # searchsorted-based nearest-key lookups
+    KEY_NUMBERS = np.array([3, 4, 6, 7, 10, 14], dtype=np.uint8)
+
+def distance_to_key(spread: float) -> float:
+    """
+    Distance from a spread to the nearest key number
+
+    Binary search on the pre-sorted KEY_NUMBERS array instead of a
+    min() scan over a Python list.
+    """
+    keys = BettingConfig.KEY_NUMBERS
+    abs_spread = abs(spread)
+    idx = int(np.searchsorted(keys, abs_spread))
+    lo = keys[max(0, idx - 1)]
+    hi = keys[min(len(keys) - 1, idx)]
+    return min(abs(abs_spread - lo), abs(abs_spread - hi))
+
 
 # =============================================================================
 # TRAVEL SETTINGS
@@ -378,6 +407,30 @@ class MarketConfig:
 # TEAM ABBREVIATIONS
 # =============================================================================
 
+class TeamId(IntEnum):
+    """Canonical 0..31 team ids (division order, matching TeamsConfig.ALL_TEAMS)
+
+    Per-team tables can be fixed-size numpy arrays indexed by TeamId
+    instead of string-keyed dicts, so hot loops do array indexing rather
+    than hashing abbreviations.
+    """
+    # AFC East / North / South / West
+    BUF = 0; MIA = 1; NE = 2; NYJ = 3
+    BAL = 4; CIN = 5; CLE = 6; PIT = 7
+    HOU = 8; IND = 9; JAX = 10; TEN = 11
+    DEN = 12; KC = 13; LV = 14; LAC = 15
+    # NFC East / North / South / West
+    DAL = 16; NYG = 17; PHI = 18; WAS = 19
+    CHI = 20; DET = 21; GB = 22; MIN = 23
+    ATL = 24; CAR = 25; NO = 26; TB = 27
+    ARI = 28; LA = 29; SF = 30; SEA = 31
+
+
+def team_id(abbr: str) -> TeamId:
+    """Resolve a team abbreviation to its TeamId (use at parse boundaries only)"""
+    return TeamId[abbr]
+
+
 class TeamsConfig:
     """NFL team information"""
     
@@ -426,6 +479,10 @@ class TeamsConfig:
         'ARI': 'MT', 'LA': 'PT', 'SF': 'PT', 'SEA': 'PT',
     }
     
+    # Timezone codes (ET=0, CT=1, MT=2, PT=3) as a uint8 array indexed by
+    # TeamId — hot paths index this instead of hashing abbreviations.
+    TZ_CODES = {'ET': 0, 'CT': 1, 'MT': 2, 'PT': 3}
+
     # Teams with special factors
     ALTITUDE_TEAMS = ['DEN']  # Mile High
     COLD_WEATHER_TEAMS = ['BUF', 'GB', 'CHI', 'DEN', 'NE']
@@ -434,6 +491,13 @@ class TeamsConfig:
     # Known loud stadiums (historically top crowd noise)
     LOUD_STADIUMS = ['SEA', 'KC', 'NO', 'BUF', 'PHI', 'GB', 'DAL', 'MIN']
 
+
+# TeamId-indexed timezone array built from the dict above
+TeamsConfig.TZ_ARR = np.array(
+    [TeamsConfig.TZ_CODES[TeamsConfig.TEAM_TIMEZONES[t.name]] for t in TeamId],
+    dtype=np.uint8,
+)
+
 # =============================================================================
 # EXPORT ALL CONFIGS
 # =============================================================================
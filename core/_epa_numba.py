@@ -0,0 +1,79 @@
+"""
+Numba-compiled EPA reduction kernel.
+
+calculate_team_epa needs mean, std, and success rate of the same epa
+array — three separate full passes through memory when done with
+numpy. The JIT kernel fuses them into one pass (Welford for the
+variance), cutting memory traffic ~3x on full-season arrays. numba
+stays optional — without it a numpy multi-pass fallback produces the
+same numbers.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op decorator when numba is not installed"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _epa_reduce_jit(epa, success_positive):
+    """
+    One-pass mean/std/success-rate over an epa array.
+
+    NaN entries are skipped for mean/std (pandas skipna semantics) but
+    stay in the success-rate denominator, matching (epa > 0).mean().
+    """
+    n_total = len(epa)
+    n_valid = 0
+    mean = 0.0
+    m2 = 0.0
+    succ = 0
+    for i in range(n_total):
+        x = epa[i]
+        if success_positive:
+            if x > 0.0:
+                succ += 1
+        else:
+            if x < 0.0:
+                succ += 1
+        if not np.isnan(x):
+            n_valid += 1
+            delta = x - mean
+            mean += delta / n_valid
+            m2 += delta * (x - mean)
+
+    if n_valid == 0:
+        return np.nan, np.nan, succ / n_total if n_total > 0 else np.nan
+    std = np.sqrt(m2 / (n_valid - 1)) if n_valid > 1 else np.nan
+    return mean, std, succ / n_total
+
+
+def epa_reduce(epa: np.ndarray, success_positive: bool = True):
+    """
+    Fused mean/std/success-rate reduction.
+
+    Args:
+        epa: EPA values (may contain NaN)
+        success_positive: True counts epa > 0 as success (offense),
+            False counts epa < 0 (defensive stops)
+
+    Returns:
+        Tuple of (mean, std with ddof=1, success_rate)
+    """
+    if NUMBA_AVAILABLE:
+        return _epa_reduce_jit(np.asarray(epa, dtype=np.float64), success_positive)
+
+    # numpy fallback: same numbers in three vector passes
+    mean = np.nanmean(epa)
+    std = np.nanstd(epa, ddof=1)
+    succ = np.mean(epa > 0) if success_positive else np.mean(epa < 0)
+    return mean, std, succ
@@ -0,0 +1,70 @@
+"""
+Numba-compiled Kelly + key-number kernel.
+
+The Kelly sizing and key-number crossing test are pure arithmetic and
+sit inside Monte-Carlo/backtest hot loops, so they are JIT-compiled
+when numba is installed. numba stays optional — without it the same
+functions run as plain Python.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op decorator when numba is not installed"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def kelly_and_key(model_prob, american_odds, edge_points, market_spread,
+                  kelly_frac, reduce_near_key, max_bet_pct):
+    """
+    Scalar Kelly fraction plus key-number crossing flag.
+
+    Returns:
+        tuple: (kelly_fraction, crosses_key)
+    """
+    if american_odds < 0:
+        b = 100.0 / abs(american_odds)
+    else:
+        b = american_odds / 100.0
+
+    q = 1.0 - model_prob
+    k = (b * model_prob - q) / b
+    k *= kelly_frac
+
+    ms = abs(market_spread)
+    hi = ms + edge_points
+    lo = ms - edge_points
+    crosses = (ms <= 3.0 <= hi) or (ms >= 3.0 >= lo) or (ms <= 7.0 <= hi) or (ms >= 7.0 >= lo)
+
+    if crosses:
+        k *= reduce_near_key
+    if k > max_bet_pct:
+        k = max_bet_pct
+
+    return (k if k > 0.0 else 0.0), crosses
+
+
+@njit(cache=True, fastmath=True)
+def kelly_and_key_vec(model_prob, american_odds, edge_points, market_spread,
+                      kelly_frac, reduce_near_key, max_bet_pct):
+    """
+    Vectorized variant over 1D arrays; returns (kelly, crosses) arrays.
+    """
+    n = len(model_prob)
+    kelly = np.empty(n, dtype=np.float64)
+    crosses = np.empty(n, dtype=np.bool_)
+    for i in range(n):
+        kelly[i], crosses[i] = kelly_and_key(
+            model_prob[i], american_odds[i], edge_points[i], market_spread[i],
+            kelly_frac, reduce_near_key, max_bet_pct
+        )
+    return kelly, crosses
@@ -1,6 +1,9 @@
 """Betting intelligence and analysis."""
 
 from typing import Dict, Optional
+
+import numpy as np
+
 from utils.kelly import KellyCalculator
 from config import BettingConfig
 from logger import get_logger
@@ -10,11 +13,13 @@ logger = get_logger(__name__)
 
 class BettingAnalyzer:
     """Analyze betting angles and calculate optimal bet sizing."""
-    
+
     def __init__(self):
         """Initialize betting analyzer."""
         self.kelly_calc = KellyCalculator()
         self.key_numbers = BettingConfig.KEY_NUMBERS
+        # Sorted float copy for searchsorted-based nearest-key lookup
+        self._keys = np.sort(np.asarray(BettingConfig.KEY_NUMBERS, dtype=np.float64))
     
     def calculate_betting_recommendation(self, win_prob: float, spread: float, 
                                         odds: int = -110, bankroll: float = 10000) -> Dict:
@@ -51,7 +56,12 @@ class BettingAnalyzer:
             Dict with key number analysis
         """
         abs_spread = abs(spread)
-        nearest_key = min(self.key_numbers, key=lambda x: abs(x - abs_spread))
+        # Binary search on the sorted key array, then compare the two
+        # neighbors — no Python min()/lambda per key number.
+        k = self._keys
+        i = int(np.searchsorted(k, abs_spread))
+        cand = k[max(i - 1, 0):min(i + 1, len(k)) + 1]
+        nearest_key = float(cand[np.argmin(np.abs(cand - abs_spread))])
         distance = abs(abs_spread - nearest_key)
         
         is_key_number = distance < 0.5
@@ -73,6 +83,31 @@ class BettingAnalyzer:
         
         return analysis
     
+    def analyze_key_numbers_vec(self, spreads: np.ndarray) -> Dict:
+        """
+        Vectorized key-number analysis over an array of spreads.
+
+        Returns:
+            Dict of arrays with the same keys as analyze_key_numbers
+        """
+        spreads = np.asarray(spreads, dtype=np.float64)
+        abs_spread = np.abs(spreads)
+        k = self._keys
+        i = np.searchsorted(k, abs_spread)
+        lo = k[np.maximum(i - 1, 0)]
+        hi = k[np.minimum(i, len(k) - 1)]
+        nearest_key = np.where(np.abs(abs_spread - lo) <= np.abs(abs_spread - hi), lo, hi)
+        distance = np.abs(abs_spread - nearest_key)
+
+        return {
+            'spread': spreads,
+            'abs_spread': abs_spread,
+            'nearest_key_number': nearest_key,
+            'distance_from_key': distance,
+            'is_key_number': distance < 0.5,
+            'at_risk_of_push': (distance >= 0.5) & (distance < 1.0),
+        }
+
     def calculate_clv(self, bet_spread: float, closing_spread: float) -> float:
         """
         Calculate Closing Line Value.
@@ -4,31 +4,50 @@ Compares model predictions vs market lines and generates actionable bet recommen
 """
 from __future__ import annotations
 
+import sys
+
 import pandas as pd
 import numpy as np
+from collections import defaultdict
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from dataclasses import dataclass
-from enum import Enum
+from dataclasses import dataclass, field
+from enum import IntEnum
 
 from config import BettingConfig, KickerConfig, MarketConfig
+from core._kelly_numba import kelly_and_key
 from logger import get_logger
 
 logger = get_logger(__name__)
 
 
-class BetSignal(Enum):
-    """Bet signal strength"""
-    STRONG_BET = "STRONG BET"
-    MEDIUM_BET = "MEDIUM BET"
-    LEAN = "LEAN"
-    AVOID = "AVOID"
-    NO_PLAY = "NO PLAY"
+class BetSignal(IntEnum):
+    """Bet signal strength — int values double as the sort order, so
+    sorting and dict lookups compare plain ints instead of going
+    through Enum.__eq__/__hash__."""
+    STRONG_BET = 0
+    MEDIUM_BET = 1
+    LEAN = 2
+    NO_PLAY = 3
+    AVOID = 4
+
+    @property
+    def label(self) -> str:
+        """Display string (the old Enum string value)."""
+        return _SIGNAL_LABELS[self]
+
 
+_SIGNAL_LABELS = ("STRONG BET", "MEDIUM BET", "LEAN", "NO PLAY", "AVOID")
 
-@dataclass
+
+@dataclass(slots=True)
 class BettingRecommendation:
-    """Single betting recommendation"""
+    """Single betting recommendation
+
+    Slotted: backtests hold tens of thousands of these, and fixed
+    attribute slots cut per-instance memory and speed up the
+    attribute-heavy sort/format loops.
+    """
     game: str
     game_date: str  # Game date (e.g. 'Jan 18, 2026')
     recommended_side: str
@@ -42,21 +61,32 @@ class BettingRecommendation:
     confidence: str
     reasoning: List[str]
     warnings: List[str]
-    
+    # Rendered-string cache — reprs are re-printed in reports/backtests
+    _str_cache: Optional[str] = field(default=None, repr=False, compare=False)
+
     def __str__(self) -> str:
-        return (
-            f"\n{'='*80}\n"
-            f"🎯 {self.signal.value}: {self.recommended_side}\n"
-            f"{'='*80}\n"
-            f"Game: {self.game}\n"
-            f"Model Line: {self.model_spread:+.1f}\n"
-            f"Market Line: {self.market_spread:+.1f}\n"
-            f"Edge: {self.edge_points:+.1f} pts ({self.edge_percent:+.1%})\n"
-            f"Confidence: {self.confidence}\n"
-            f"Suggested Units: {self.suggested_units:.1f}\n"
-            f"\nReasoning:\n" + "\n".join(f"  ✓ {r}" for r in self.reasoning) +
-            (f"\n\n⚠️  Warnings:\n" + "\n".join(f"  • {w}" for w in self.warnings) if self.warnings else "")
-        )
+        if self._str_cache is None:
+            bar = '=' * 80
+            parts = [
+                "",
+                bar,
+                f"🎯 {self.signal.label}: {self.recommended_side}",
+                bar,
+                f"Game: {self.game}",
+                f"Model Line: {self.model_spread:+.1f}",
+                f"Market Line: {self.market_spread:+.1f}",
+                f"Edge: {self.edge_points:+.1f} pts ({self.edge_percent:+.1%})",
+                f"Confidence: {self.confidence}",
+                f"Suggested Units: {self.suggested_units:.1f}",
+                "",
+                "Reasoning:",
+            ]
+            parts.extend(f"  ✓ {r}" for r in self.reasoning)
+            if self.warnings:
+                parts.extend(["", "⚠️  Warnings:"])
+                parts.extend(f"  • {w}" for w in self.warnings)
+            self._str_cache = '\n'.join(parts)
+        return self._str_cache
 
 
 class BettingSignalGenerator:
@@ -200,15 +230,15 @@ class BettingSignalGenerator:
             return BetSignal.NO_PLAY
     
     def _crosses_key_number(self, market_spread: float, edge_points: float) -> bool:
-        """Check if the edge crosses a key number (3, 7)."""
-        key_numbers = BettingConfig.KEY_NUMBERS[:2]  # Focus on 3 and 7
-        
-        for key in key_numbers:
-            if abs(market_spread) <= key <= abs(market_spread) + edge_points:
-                return True
-            if abs(market_spread) >= key >= abs(market_spread) - edge_points:
-                return True
-        return False
+        """Check if the edge crosses a key number (3, 7).
+
+        Unrolled over the two biggest key numbers — a single branchless
+        expression, no loop or tuple allocation in this hot path.
+        """
+        a = abs(market_spread)
+        hi = a + edge_points
+        lo = a - edge_points
+        return (a <= 3 <= hi) or (a >= 3 >= lo) or (a <= 7 <= hi) or (a >= 7 >= lo)
     
     def _calculate_kelly(
         self,
@@ -217,36 +247,51 @@ class BettingSignalGenerator:
         edge_points: float,
         market_spread: float
     ) -> float:
-        """Calculate Kelly fraction for bet sizing."""
-        
-        # Convert American odds to decimal
-        if market_odds < 0:
-            decimal_odds = 1 + (100 / abs(market_odds))
-        else:
-            decimal_odds = 1 + (market_odds / 100)
-        
-        # Kelly formula: (bp - q) / b
-        # where b = decimal odds - 1, p = win prob, q = 1 - p
-        b = decimal_odds - 1
-        p = model_prob
-        q = 1 - p
-        
-        kelly = (b * p - q) / b
-        
-        # Apply fractional Kelly (quarter Kelly = safest)
-        fractional_kelly = kelly * BettingConfig.KELLY_FRACTION
-        
-        # Reduce Kelly if betting through key numbers
-        if self._crosses_key_number(market_spread, edge_points):
-            fractional_kelly *= MarketConfig.REDUCE_KELLY_NEAR_KEY
-        
-        # Cap at max bet size
-        max_kelly = BettingConfig.MAX_BET_SIZE_PCT
-        fractional_kelly = min(fractional_kelly, max_kelly)
-        
-        # Floor at 0 (no negative bets)
-        return max(0, fractional_kelly)
-    
+        """Calculate Kelly fraction for bet sizing (JIT-compiled kernel)."""
+        kelly, _ = kelly_and_key(
+            model_prob, market_odds, edge_points, market_spread,
+            BettingConfig.KELLY_FRACTION,
+            MarketConfig.REDUCE_KELLY_NEAR_KEY,
+            BettingConfig.MAX_BET_SIZE_PCT,
+        )
+        return kelly
+
+    @staticmethod
+    def calculate_kelly_batch(
+        model_prob: np.ndarray,
+        market_odds: np.ndarray,
+        reduce_mask: np.ndarray,
+        kelly_frac: float = None,
+        max_pct: float = None
+    ) -> np.ndarray:
+        """
+        Fractional Kelly over whole arrays (bankroll sweeps, backtests).
+
+        Same math as _calculate_kelly, but each step is one NumPy pass
+        so Monte-Carlo callers size thousands of bets per call instead
+        of once per Python invocation.
+
+        Args:
+            model_prob: Win probabilities (0-1)
+            market_odds: American odds
+            reduce_mask: True where sizing should shrink (near key numbers)
+            kelly_frac: Kelly fraction (default from config)
+            max_pct: Bankroll cap per bet (default from config)
+
+        Returns:
+            Array of Kelly fractions, clipped to [0, max_pct]
+        """
+        if kelly_frac is None:
+            kelly_frac = BettingConfig.KELLY_FRACTION
+        if max_pct is None:
+            max_pct = BettingConfig.MAX_BET_SIZE_PCT
+
+        b = np.where(market_odds < 0, 100 / np.abs(market_odds), market_odds / 100)
+        kelly = (b * model_prob - (1 - model_prob)) / b
+        kelly *= kelly_frac
+        kelly = np.where(reduce_mask, kelly * MarketConfig.REDUCE_KELLY_NEAR_KEY, kelly)
+        return np.clip(kelly, 0, max_pct)
+
     def _build_reasoning(
         self,
         model_prediction: Dict,
@@ -324,6 +369,59 @@ class BettingSignalGenerator:
         
         return warnings
     
+    def _vectorized_core(
+        self,
+        model_spread: np.ndarray,
+        market_spread: np.ndarray,
+        model_prob: np.ndarray,
+        market_odds: np.ndarray,
+        confidence: np.ndarray,
+        is_playoff: bool
+    ) -> Dict[str, np.ndarray]:
+        """
+        Batch-compute the numeric half of a betting card.
+
+        Works on stacked arrays so a thousand-game backtest pays one
+        NumPy pass instead of per-row Python arithmetic; callers
+        materialize BettingRecommendation objects afterwards.
+        """
+        edge_points = np.abs(model_spread - market_spread)
+        abs_market = np.abs(market_spread)
+        edge_percent = np.where(abs_market > 0.01, edge_points / np.where(abs_market > 0.01, abs_market, 1.0), edge_points * 100)
+
+        # Key-number crossings: broadcast spreads against (3, 7)
+        keys = np.array([3.0, 7.0])
+        hi = (abs_market[:, None] <= keys) & (keys <= (abs_market + edge_points)[:, None])
+        lo = (abs_market[:, None] >= keys) & (keys >= (abs_market - edge_points)[:, None])
+        crosses = (hi | lo).any(axis=1)
+
+        # Kelly sizing (same formula as _calculate_kelly)
+        kelly = self.calculate_kelly_batch(model_prob, market_odds, crosses)
+
+        # Signal thresholds (mirrors _determine_signal)
+        mult = 1.2 if is_playoff else 1.0
+        high = confidence == 'HIGH'
+        high_or_med = high | (confidence == 'MEDIUM')
+        signals = np.select(
+            [
+                (edge_points >= 4.0 * mult) & high,
+                (edge_points >= 3.0 * mult) & high_or_med,
+                edge_points >= 2.5 * mult,
+                (edge_points >= 1.5 * mult) & ~crosses,
+                edge_points >= 1.0,
+            ],
+            [0, 0, 1, 2, 2],
+            default=3,
+        )
+
+        return {
+            'edge_points': edge_points,
+            'edge_percent': edge_percent,
+            'crosses_key': crosses,
+            'kelly_fraction': kelly,
+            'signal_code': signals,
+        }
+
     def generate_weekly_card(
         self,
         predictions: List[Dict],
@@ -332,89 +430,124 @@ class BettingSignalGenerator:
     ) -> List[BettingRecommendation]:
         """
         Generate full weekly betting card with all recommendations.
-        
+
         Args:
             predictions: List of model prediction dicts
             market_lines: Dict mapping "AWAY @ HOME" to spread (positive = home favored)
             is_playoff: Whether these are playoff games
-            
+
         Returns:
             List of BettingRecommendation objects, sorted by signal strength
         """
-        recommendations = []
-        
+        # Keep only games with a market line, warning as before
+        priced = []
         for pred in predictions:
             game_key = f"{pred['away_team']} @ {pred['home_team']}"
-            
             if game_key not in market_lines:
                 self.logger.warning(f"No market line found for {game_key}")
                 continue
-            
-            # Extract game date from prediction if available
-            game_date = pred.get('game_date', 'TBD')
-            
-            rec = self.generate_recommendation(
-                game=game_key,
-                home_team=pred['home_team'],
-                away_team=pred['away_team'],
-                model_prediction=pred,
-                market_spread=market_lines[game_key],
-                is_playoff=is_playoff,
-                game_date=game_date
-            )
-            
-            recommendations.append(rec)
-        
-        # Sort by signal strength then edge
-        signal_order = {
-            BetSignal.STRONG_BET: 0,
-            BetSignal.MEDIUM_BET: 1,
-            BetSignal.LEAN: 2,
-            BetSignal.NO_PLAY: 3,
-            BetSignal.AVOID: 4
-        }
-        
-        recommendations.sort(
-            key=lambda x: (signal_order[x.signal], -x.edge_points)
+            # Validate required prediction fields before the arrays are
+            # stacked — same contract as generate_recommendation
+            spread = pred.get('predicted_spread')
+            prob = pred.get('win_probability')
+            if spread is None or prob is None:
+                raise ValueError(
+                    f"Invalid prediction for {game_key}: missing required fields. "
+                    f"Got: predicted_spread={spread}, win_probability={prob}"
+                )
+            priced.append((game_key, pred))
+
+        if not priced:
+            return []
+
+        # Vectorized numeric pass over the whole card
+        model_spread = np.array([p['predicted_spread'] for _, p in priced])
+        market_spread = np.array([market_lines[k] for k, _ in priced])
+        model_prob = np.array([p['win_probability'] for _, p in priced])
+        market_odds = np.full(len(priced), -110)
+        confidence = np.array([p.get('confidence_level', 'MEDIUM') for _, p in priced])
+
+        core = self._vectorized_core(
+            model_spread, market_spread, model_prob, market_odds,
+            confidence, is_playoff
         )
-        
-        return recommendations
+
+        # Materialize the dataclasses (reasoning/warnings stay per-game)
+        recommendations = []
+        for i, (game_key, pred) in enumerate(priced):
+            if model_spread[i] > market_spread[i]:
+                recommended_side = f"{pred['home_team']} {market_spread[i]:+.1f}"
+            else:
+                recommended_side = f"{pred['away_team']} {-market_spread[i]:+.1f}"
+
+            kelly_fraction = float(core['kelly_fraction'][i])
+            edge_points = float(core['edge_points'][i])
+
+            recommendations.append(BettingRecommendation(
+                game=game_key,
+                game_date=pred.get('game_date', 'TBD'),
+                recommended_side=recommended_side,
+                signal=BetSignal(core['signal_code'][i]),
+                model_spread=float(model_spread[i]),
+                market_spread=float(market_spread[i]),
+                edge_points=edge_points,
+                edge_percent=float(core['edge_percent'][i]),
+                kelly_fraction=kelly_fraction,
+                suggested_units=(kelly_fraction * self.bankroll) / 100,
+                confidence=str(confidence[i]),
+                reasoning=self._build_reasoning(pred, edge_points, is_playoff),
+                warnings=self._build_warnings(edge_points, float(market_spread[i]), pred)
+            ))
+
+        # Sort by signal strength then edge: lexsort over the already-
+        # computed signal/edge arrays — one C-level pass, no per-compare
+        # Python lambda
+        order = np.lexsort((-core['edge_points'], core['signal_code']))
+        return [recommendations[i] for i in order]
     
     def print_weekly_card(self, recommendations: List[BettingRecommendation]) -> None:
-        """Print formatted weekly betting card."""
-        
-        print("\n" + "="*80)
-        print("🏈 WEEKLY BETTING CARD 🏈")
-        print("="*80)
-        print(f"Generated: {datetime.now().strftime('%Y-%m-%d %I:%M %p')}")
-        print(f"Bankroll: ${self.bankroll:,.0f}")
-        print("="*80)
-        
-        # Group by signal
-        by_signal = {}
+        """Print formatted weekly betting card.
+
+        The card is assembled in a list and flushed with one
+        sys.stdout.write — one syscall instead of one lock/flush per
+        print, which matters when cards are dumped to a file.
+        """
+        bar = "=" * 80
+        buf = [
+            "",
+            bar,
+            "🏈 WEEKLY BETTING CARD 🏈",
+            bar,
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %I:%M %p')}",
+            f"Bankroll: ${self.bankroll:,.0f}",
+            bar,
+        ]
+
+        # Group by signal — single pass, one dict lookup per rec
+        by_signal = defaultdict(list)
         for rec in recommendations:
-            if rec.signal not in by_signal:
-                by_signal[rec.signal] = []
             by_signal[rec.signal].append(rec)
-        
-        # Print each group
+
+        # Render each group
         for signal in [BetSignal.STRONG_BET, BetSignal.MEDIUM_BET, BetSignal.LEAN, BetSignal.NO_PLAY]:
             if signal in by_signal:
-                print(f"\n{'='*80}")
-                print(f"{signal.value} ({len(by_signal[signal])} games)")
-                print(f"{'='*80}")
-                
-                for rec in by_signal[signal]:
-                    print(rec)
-        
+                buf.extend(["", bar, f"{signal.label} ({len(by_signal[signal])} games)", bar])
+                buf.extend(str(rec) for rec in by_signal[signal])
+
         # Summary
         strong_bets = [r for r in recommendations if r.signal == BetSignal.STRONG_BET]
         total_units = sum(r.suggested_units for r in strong_bets)
-        
-        print(f"\n{'='*80}")
-        print(f"📊 SUMMARY")
-        print(f"{'='*80}")
-        print(f"Strong Bets: {len(strong_bets)}")
-        print(f"Total Suggested Units: {total_units:.1f}")
-        print(f"Total Risk: ${total_units * 100:,.0f} ({total_units * 100 / self.bankroll:.1%} of bankroll)")
-        print(f"{'='*80}\n")
+
+        buf.extend([
+            "",
+            bar,
+            "📊 SUMMARY",
+            bar,
+            f"Strong Bets: {len(strong_bets)}",
+            f"Total Suggested Units: {total_units:.1f}",
+            f"Total Risk: ${total_units * 100:,.0f} ({total_units * 100 / self.bankroll:.1%} of bankroll)",
+            bar,
+            "",
+        ])
+
+        sys.stdout.write('\n'.join(buf) + '\n')
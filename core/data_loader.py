@@ -3,12 +3,12 @@ NFL data loading with caching and error handling.
 """
 
 import nflreadpy as nfl
+import numpy as np
 import polars as pl
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
 import os
-import pickle
 
 from config import SeasonConfig
 from logger import get_logger
@@ -34,128 +34,262 @@ class NFLDataLoader:
             self.phase = "Unknown"
         
         self.cache_dir = ".cache"
-        self.cache_file = os.path.join(self.cache_dir, f"pbp_{self.season}.pkl")
+        self.cache_file = os.path.join(self.cache_dir, f"pbp_{self.season}.parquet")
+        self._pbp_polars = None
         self._pbp_data = None
-        
+
+        # Memoized per-team query results — PBP is immutable within a
+        # session, so repeated lookups (two teams per matchup, every
+        # game of a card) are served from these dicts after first use
+        self._team_plays_cache = {}
+        self._recent_games_cache = {}
+        self._opponent_adjusted_cache = {}
+
+        # Precomputed positional row indices per team (built on load)
+        self._posteam_idx = {}
+        self._defteam_idx = {}
+
         # Create cache directory
         os.makedirs(self.cache_dir, exist_ok=True)
-    
-    def load_play_by_play(self, force_refresh: bool = False) -> pd.DataFrame:
+
+    def _clear_memo_caches(self):
+        """Drop memoized per-team results (after a data refresh)."""
+        self._team_plays_cache.clear()
+        self._recent_games_cache.clear()
+        self._opponent_adjusted_cache.clear()
+
+    @staticmethod
+    def _mark_game_sorted(pbp: pl.DataFrame) -> pl.DataFrame:
         """
-        Load NFL play-by-play data with caching.
-        
+        Sort chronologically and declare game_id sorted.
+
+        The sortedness flag lets Polars use its sorted-keys fast path
+        for unique()/group_by on game_id; the flag is not persisted in
+        Parquet, so it is re-declared on every load.
+        """
+        keys = [c for c in ('game_id', 'play_id') if c in pbp.columns]
+        if 'game_id' not in keys:
+            return pbp
+        return pbp.sort(keys).with_columns(pl.col('game_id').set_sorted())
+
+    def _read_cache(self) -> Tuple[Optional[pl.DataFrame], Optional[timedelta]]:
+        """
+        Read the Parquet disk cache at most once.
+
+        A single os.stat gives existence and mtime together, and the
+        frame read here is reused by the stale-fallback path instead of
+        hitting the disk a second time.
+
+        Returns:
+            Tuple of (frame or None, cache age or None if no cache file)
+        """
+        try:
+            st = os.stat(self.cache_file)
+        except FileNotFoundError:
+            return None, None
+        age = datetime.now() - datetime.fromtimestamp(st.st_mtime)
+        try:
+            return self._mark_game_sorted(pl.read_parquet(self.cache_file)), age
+        except Exception as e:
+            logger.warning(f"Cache read failed: {e}")
+            return None, age
+
+    def load_play_by_play_polars(self, force_refresh: bool = False) -> pl.DataFrame:
+        """
+        Load NFL play-by-play data as a Polars DataFrame with caching.
+
+        Fetching, filtering, and the disk cache all stay columnar; the
+        pandas conversion happens once, lazily, in load_play_by_play.
+
         Args:
             force_refresh: Force re-download from API
-            
+
         Returns:
-            DataFrame with play-by-play data
+            Polars DataFrame with play-by-play data
         """
         # Check cache first
-        if not force_refresh and self._pbp_data is not None:
+        if not force_refresh and self._pbp_polars is not None:
             logger.debug("Using in-memory cached data")
-            return self._pbp_data
-        
-        # Check disk cache
-        if not force_refresh and os.path.exists(self.cache_file):
-            cache_age = datetime.now() - datetime.fromtimestamp(os.path.getmtime(self.cache_file))
-            if cache_age < timedelta(hours=SeasonConfig.CACHE_HOURS):
+            return self._pbp_polars
+
+        # Check disk cache — read once; kept around for stale fallback
+        cached, cache_age = (None, None)
+        if not force_refresh:
+            cached, cache_age = self._read_cache()
+            if cached is not None and cache_age < timedelta(hours=SeasonConfig.CACHE_HOURS):
                 logger.info(f"Loading from disk cache (age: {cache_age.total_seconds()/3600:.1f}h)")
-                try:
-                    with open(self.cache_file, 'rb') as f:
-                        self._pbp_data = pickle.load(f)
-                    return self._pbp_data
-                except Exception as e:
-                    logger.warning(f"Cache read failed: {e}, fetching fresh data")
-        
+                self._pbp_polars = cached
+                return self._pbp_polars
+
         # Fetch from API
         logger.info(f"Fetching {self.season} NFL data from API...")
         try:
             pbp = nfl.load_pbp([self.season])
-            
-            # Validate data
-            actual_seasons = pbp['season'].unique().to_list()
-            if actual_seasons[0] != self.season:
-                logger.warning(f"Season mismatch: requested {self.season}, got {actual_seasons[0]}")
-            
-            # Filter to regular season and relevant plays
-            pbp_reg = pbp.filter(pl.col('season_type') == 'REG')
-            pbp_reg = pbp_reg.filter((pl.col('rush') == 1) | (pl.col('pass') == 1))
-            self._pbp_data = pbp_reg.to_pandas()
-            
-            logger.info(f"Loaded {len(self._pbp_data)} regular season plays")
-            
-            # Cache to disk
+
+            # Validate data — O(1) scalar read, no full-column unique()
+            first_season = pbp.get_column('season').first()
+            if first_season != self.season:
+                logger.warning(f"Season mismatch: requested {self.season}, got {first_season}")
+
+            # Filter to regular season and relevant plays (single fused
+            # predicate — one scan, no intermediate frame)
+            self._pbp_polars = self._mark_game_sorted(
+                pbp.lazy()
+                .filter(
+                    (pl.col('season_type') == 'REG')
+                    & ((pl.col('rush') == 1) | (pl.col('pass') == 1))
+                )
+                .collect()
+            )
+
+            logger.info(f"Loaded {len(self._pbp_polars)} regular season plays")
+
+            # Cache to disk (Parquet: columnar, typed, compressed — much
+            # faster to rehydrate than pickling a DataFrame)
             try:
-                with open(self.cache_file, 'wb') as f:
-                    pickle.dump(self._pbp_data, f)
+                self._pbp_polars.write_parquet(self.cache_file, compression='zstd')
                 logger.debug(f"Cached data to {self.cache_file}")
             except Exception as e:
                 logger.warning(f"Cache write failed: {e}")
-            
-            return self._pbp_data
-            
+
+            return self._pbp_polars
+
         except Exception as e:
             logger.error(f"Failed to fetch NFL data: {e}")
-            
-            # Try to use stale cache as fallback
-            if os.path.exists(self.cache_file):
+
+            # Try to use stale cache as fallback — already read above
+            # unless force_refresh skipped it
+            if cached is None:
+                cached, _ = self._read_cache()
+            if cached is not None:
                 logger.warning("Using stale cache as fallback")
-                try:
-                    with open(self.cache_file, 'rb') as f:
-                        self._pbp_data = pickle.load(f)
-                    return self._pbp_data
-                except Exception as cache_err:
-                    logger.error(f"Stale cache also failed: {cache_err}")
-            
+                self._pbp_polars = cached
+                return self._pbp_polars
+
             raise RuntimeError(f"Cannot load NFL data: {e}")
-    
+
+    def load_play_by_play(self, force_refresh: bool = False) -> pd.DataFrame:
+        """
+        Load NFL play-by-play data with caching.
+
+        The pandas conversion is deferred to this boundary and done at
+        most once per session; Polars-native consumers should prefer
+        load_play_by_play_polars and skip it entirely.
+
+        Args:
+            force_refresh: Force re-download from API
+
+        Returns:
+            DataFrame with play-by-play data
+        """
+        if not force_refresh and self._pbp_data is not None:
+            return self._pbp_data
+
+        df = self.load_play_by_play_polars(force_refresh).to_pandas()
+
+        # Categorical team/game columns: 32 teams at most, so equality
+        # filters compare small integer codes instead of Python strings
+        for col in ('posteam', 'defteam', 'home_team', 'away_team', 'season_type', 'game_id',
+                    'field_goal_result'):
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+
+        # Partition the frame by team once: positional row indices per
+        # posteam/defteam, so team queries gather rows instead of
+        # re-scanning the full frame (32 teams × ~50k bools is cheap)
+        self._posteam_idx = {
+            t: np.flatnonzero(df['posteam'].values == t)
+            for t in df['posteam'].dropna().unique()
+        }
+        self._defteam_idx = {
+            t: np.flatnonzero(df['defteam'].values == t)
+            for t in df['defteam'].dropna().unique()
+        }
+
+        self._pbp_data = df
+        self._clear_memo_caches()
+        return self._pbp_data
+
+    def _is_session_frame(self, pbp: pd.DataFrame) -> bool:
+        """True if pbp is the loader's own frame (safe to memoize against)."""
+        return self._pbp_data is not None and pbp is self._pbp_data
+
     def get_team_plays(self, team: str, pbp: Optional[pd.DataFrame] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Get offensive and defensive plays for a team.
-        
+
+        Results are memoized per team for the session's frame.
+
         Args:
             team: Team abbreviation (e.g., 'DEN')
             pbp: Play-by-play data (loads if None)
-            
+
         Returns:
             Tuple of (offensive_plays, defensive_plays)
         """
         if pbp is None:
             pbp = self.load_play_by_play()
-        
-        offense = pbp[pbp['posteam'] == team].copy()
-        defense = pbp[pbp['defteam'] == team].copy()
-        
+
+        cacheable = self._is_session_frame(pbp)
+        if cacheable and team in self._team_plays_cache:
+            return self._team_plays_cache[team]
+
+        # Read-only views downstream — skip the defensive copy, which
+        # duplicated the team's slice of the frame on every call
+        if cacheable and self._posteam_idx:
+            # Precomputed per-team partition: O(1) lookup + row gather
+            empty = np.empty(0, dtype=np.intp)
+            offense = pbp.iloc[self._posteam_idx.get(team, empty)]
+            defense = pbp.iloc[self._defteam_idx.get(team, empty)]
+        else:
+            offense = pbp.loc[pbp['posteam'] == team]
+            defense = pbp.loc[pbp['defteam'] == team]
+
         logger.debug(f"{team}: {len(offense)} offensive plays, {len(defense)} defensive plays")
-        
+
+        if cacheable:
+            self._team_plays_cache[team] = (offense, defense)
+
         return offense, defense
-    
-    def get_recent_games(self, team: str, num_games: int = 4, 
+
+    def get_recent_games(self, team: str, num_games: int = 4,
                         pbp: Optional[pd.DataFrame] = None) -> pd.DataFrame:
         """
         Get most recent games for a team.
-        
+
+        Results are memoized per (team, num_games) for the session's frame.
+
         Args:
             team: Team abbreviation
             num_games: Number of recent games
             pbp: Play-by-play data (loads if None)
-            
+
         Returns:
             DataFrame with recent game plays
         """
         if pbp is None:
             pbp = self.load_play_by_play()
-        
-        team_plays = pbp[(pbp['posteam'] == team) | (pbp['defteam'] == team)].copy()
-        
-        # Get last N games
+
+        cacheable = self._is_session_frame(pbp)
+        cache_key = (team, num_games)
+        if cacheable and cache_key in self._recent_games_cache:
+            return self._recent_games_cache[cache_key]
+
+        team_plays = pbp.loc[(pbp['posteam'] == team) | (pbp['defteam'] == team)]
+
+        # Get last N games — the frame is sorted by (game_id, play_id)
+        # at load time, so unique() preserves chronological order and
+        # the tail is the most recent games
         games = team_plays['game_id'].unique()
         recent_games = games[-num_games:] if len(games) >= num_games else games
-        
+
         recent_plays = team_plays[team_plays['game_id'].isin(recent_games)]
-        
+
         logger.debug(f"{team}: Loaded {len(recent_plays)} plays from last {len(recent_games)} games")
-        
+
+        if cacheable:
+            self._recent_games_cache[cache_key] = recent_plays
+
         return recent_plays
     
     def get_opponent_adjusted_plays(self, team: str, pbp: Optional[pd.DataFrame] = None) -> dict:
@@ -171,31 +305,42 @@ class NFLDataLoader:
         """
         if pbp is None:
             pbp = self.load_play_by_play()
-        
+
+        cacheable = self._is_session_frame(pbp)
+        if cacheable and team in self._opponent_adjusted_cache:
+            return self._opponent_adjusted_cache[team]
+
         offense, defense = self.get_team_plays(team, pbp)
-        
-        # Calculate opponent EPA
-        opponent_def_epa = {}
-        for opp in offense['defteam'].unique():
-            opp_def = pbp[pbp['defteam'] == opp]
-            if len(opp_def) > 0:
-                opponent_def_epa[opp] = opp_def['epa'].mean()
-        
-        opponent_off_epa = {}
-        for opp in defense['posteam'].unique():
-            opp_off = pbp[pbp['posteam'] == opp]
-            if len(opp_off) > 0:
-                opponent_off_epa[opp] = opp_off['epa'].mean()
-        
-        return {
+
+        # Calculate opponent EPA with one groupby per side instead of
+        # re-filtering the full frame once per opponent (~32 scans)
+        def_epa = pbp.groupby('defteam', sort=False)['epa'].mean()
+        off_epa = pbp.groupby('posteam', sort=False)['epa'].mean()
+
+        faced_defenses = offense['defteam'].unique()
+        faced_offenses = defense['posteam'].unique()
+
+        opponent_def_epa = def_epa.loc[def_epa.index.intersection(faced_defenses)].to_dict()
+        opponent_off_epa = off_epa.loc[off_epa.index.intersection(faced_offenses)].to_dict()
+
+        result = {
             'opponent_def_epa': opponent_def_epa,
             'opponent_off_epa': opponent_off_epa,
             'num_opponents': len(set(list(opponent_def_epa.keys()) + list(opponent_off_epa.keys())))
         }
-    
+
+        if cacheable:
+            self._opponent_adjusted_cache[team] = result
+
+        return result
+
     def clear_cache(self):
         """Clear cached data."""
         if os.path.exists(self.cache_file):
             os.remove(self.cache_file)
             logger.info(f"Cleared cache: {self.cache_file}")
+        self._pbp_polars = None
         self._pbp_data = None
+        self._posteam_idx = {}
+        self._defteam_idx = {}
+        self._clear_memo_caches()
@@ -7,17 +7,80 @@ import numpy as np
 from typing import Dict, Optional
 
 from config import EPAConfig, BettingConfig
+from core._epa_numba import epa_reduce
 from logger import get_logger
 
 logger = get_logger(__name__)
 
+# Season/recent blend weights, bound once at import
+_FULL_WEIGHT = EPAConfig.FULL_SEASON_WEIGHT
+_RECENT_WEIGHT = EPAConfig.RECENT_FORM_WEIGHT
+
 
 class EPAAnalyzer:
     """Analyze EPA metrics for NFL teams."""
-    
+
+    # FIFO bound shared by the memo dicts below — identity keys hold
+    # strong frame references, so without a cap a force_refresh would
+    # leave the superseded season's slices pinned for the analyzer's
+    # lifetime
+    _CACHE_MAX = 64
+
     def __init__(self):
         """Initialize EPA analyzer."""
         self.config = EPAConfig
+        # Memos keyed by frame identity: the loader hands back the
+        # same per-team frames across a slate, so comparisons and
+        # finished metric dicts are built once per frame instead of
+        # once per function call
+        self._mask_cache = {}
+        self._team_epa_cache = {}
+        self._recent_form_cache = {}
+
+    @staticmethod
+    def _bounded_put(cache: Dict, key, value) -> None:
+        """Insert into a memo dict, evicting the oldest entry at the cap."""
+        if len(cache) >= EPAAnalyzer._CACHE_MAX:
+            stale = next(iter(cache), None)
+            if stale is not None:
+                cache.pop(stale, None)
+        cache[key] = value
+
+    def _prep_play_masks(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Build the comparison masks shared by the situational and
+        explosive-play calculations, memoized by frame identity.
+
+        Args:
+            df: Offensive or defensive plays DataFrame
+
+        Returns:
+            Dict of raw column ndarrays and boolean masks
+        """
+        hit = self._mask_cache.get(id(df))
+        if hit is not None and hit[0] is df:
+            return hit[1]
+
+        masks = {'epa': df['epa'].to_numpy()}
+        if 'down' in df.columns:
+            masks['down3'] = df['down'].to_numpy() == 3
+        if 'yardline_100' in df.columns:
+            masks['rz'] = df['yardline_100'].to_numpy() <= 20
+        if 'qtr' in df.columns:
+            masks['q4'] = df['qtr'].to_numpy() == 4
+        if 'half_seconds_remaining' in df.columns:
+            hsr = df['half_seconds_remaining'].to_numpy()
+            masks['2min'] = (hsr <= 120) & (hsr > 0)
+        if 'first_down' in df.columns:
+            masks['fd'] = df['first_down'].to_numpy()
+        if 'touchdown' in df.columns:
+            masks['td'] = df['touchdown'].to_numpy()
+        if 'yards_gained' in df.columns:
+            masks['expl'] = df['yards_gained'].to_numpy() >= 20
+
+        # Holding the frame reference keeps id(df) stable for the hit check
+        self._bounded_put(self._mask_cache, id(df), (df, masks))
+        return masks
     
     def calculate_team_epa(self, offense: pd.DataFrame, defense: pd.DataFrame) -> Dict:
         """
@@ -39,30 +102,85 @@ class EPAAnalyzer:
                 'off_plays': 0,
                 'def_plays': 0
             }
-        
-        off_epa = offense['epa'].mean()
-        def_epa = defense['epa'].mean()  # Lower is better for defense
-        
+
+        cache_key = (id(offense), id(defense))
+        hit = self._team_epa_cache.get(cache_key)
+        if hit is not None and hit[0] is offense and hit[1] is defense:
+            return hit[2]
+        
+        # One ndarray pull per side, then one fused pass each: the
+        # kernel computes mean, std, and success rate together instead
+        # of three separate trips through the array
+        off_arr = offense['epa'].to_numpy()
+        def_arr = defense['epa'].to_numpy()
+
+        off_epa, off_std, off_success = epa_reduce(off_arr, success_positive=True)
+        def_epa, def_std, def_success = epa_reduce(def_arr, success_positive=False)
+        # def_epa: lower is better; def_success is the stop rate
+
         result = {
             'off_epa': off_epa,
             'def_epa': def_epa,
             'total_epa': off_epa - def_epa,  # Total team EPA
             'off_plays': len(offense),
             'def_plays': len(defense),
-            
+
             # Consistency metrics
-            'off_epa_std': offense['epa'].std(),
-            'def_epa_std': defense['epa'].std(),
-            
+            'off_epa_std': off_std,
+            'def_epa_std': def_std,
+
             # Success rates
-            'off_success_rate': (offense['epa'] > 0).mean(),
-            'def_success_rate': (defense['epa'] < 0).mean()  # Stop rate
+            'off_success_rate': off_success,
+            'def_success_rate': def_success
         }
         
         logger.debug(f"EPA calculated: Off={off_epa:.3f}, Def={def_epa:.3f}, Total={result['total_epa']:.3f}")
-        
+
+        self._bounded_put(self._team_epa_cache, cache_key, (offense, defense, result))
+
         return result
     
+    def calculate_all_teams_epa(self, pbp: pd.DataFrame) -> Dict[str, Dict]:
+        """
+        Calculate EPA metrics for every team in one pass.
+
+        Per-team calls re-filter the full frame 32 times; two groupby
+        aggregations (posteam and defteam) cover the whole league with
+        a single scan each. Success rates group a precomputed boolean
+        Series so everything stays on the cythonized aggregation path.
+
+        Args:
+            pbp: Play-by-play DataFrame
+
+        Returns:
+            Dict mapping team abbreviation to the calculate_team_epa
+            metrics dict
+        """
+        off_agg = pbp.groupby('posteam', sort=False, observed=True)['epa'].agg(['mean', 'std', 'size'])
+        def_agg = pbp.groupby('defteam', sort=False, observed=True)['epa'].agg(['mean', 'std', 'size'])
+        off_succ = (pbp['epa'] > 0).groupby(pbp['posteam'], observed=True).mean()
+        def_succ = (pbp['epa'] < 0).groupby(pbp['defteam'], observed=True).mean()
+
+        results = {}
+        for team in off_agg.index.intersection(def_agg.index):
+            off_epa = off_agg.at[team, 'mean']
+            def_epa = def_agg.at[team, 'mean']
+            results[team] = {
+                'off_epa': off_epa,
+                'def_epa': def_epa,
+                'total_epa': off_epa - def_epa,
+                'off_plays': int(off_agg.at[team, 'size']),
+                'def_plays': int(def_agg.at[team, 'size']),
+                'off_epa_std': off_agg.at[team, 'std'],
+                'def_epa_std': def_agg.at[team, 'std'],
+                'off_success_rate': off_succ[team],
+                'def_success_rate': def_succ[team]
+            }
+
+        logger.debug(f"Batch EPA calculated for {len(results)} teams")
+
+        return results
+
     def calculate_recent_form(self, team: str, recent_plays: pd.DataFrame) -> Dict:
         """
         Calculate recent form (last N games).
@@ -77,24 +195,66 @@ class EPAAnalyzer:
         if len(recent_plays) == 0:
             logger.warning(f"{team}: No recent plays available")
             return {'recent_off_epa': 0.0, 'recent_def_epa': 0.0, 'recent_games': 0}
-        
+
+        cache_key = (team, id(recent_plays))
+        hit = self._recent_form_cache.get(cache_key)
+        if hit is not None and hit[0] is recent_plays:
+            return hit[1]
+
         offense = recent_plays[recent_plays['posteam'] == team]
         defense = recent_plays[recent_plays['defteam'] == team]
         
         recent_off_epa = offense['epa'].mean() if len(offense) > 0 else 0.0
         recent_def_epa = defense['epa'].mean() if len(defense) > 0 else 0.0
         
-        num_games = len(recent_plays['game_id'].unique())
+        # nunique counts through the hashset directly — no intermediate
+        # unique-values array
+        num_games = recent_plays['game_id'].nunique()
         
         logger.debug(f"{team} recent form ({num_games} games): Off={recent_off_epa:.3f}, Def={recent_def_epa:.3f}")
-        
-        return {
+
+        result = {
             'recent_off_epa': recent_off_epa,
             'recent_def_epa': recent_def_epa,
             'recent_total_epa': recent_off_epa - recent_def_epa,
             'recent_games': num_games
         }
+        self._bounded_put(self._recent_form_cache, cache_key, (recent_plays, result))
+        return result
     
+    def calculate_all_recent_form(self, recent_plays: pd.DataFrame) -> Dict[str, Dict]:
+        """
+        Calculate recent form for every team in one pass.
+
+        Per-team calls scan the recent-plays frame twice per team; two
+        grouped means plus one grouped nunique cover the whole league.
+
+        Args:
+            recent_plays: Recent plays DataFrame spanning all teams
+
+        Returns:
+            Dict mapping team abbreviation to the calculate_recent_form
+            metrics dict
+        """
+        off_means = recent_plays.groupby('posteam', sort=False, observed=True)['epa'].mean()
+        def_means = recent_plays.groupby('defteam', sort=False, observed=True)['epa'].mean()
+        num_games = recent_plays.groupby('posteam', sort=False, observed=True)['game_id'].nunique()
+
+        results = {}
+        for team in off_means.index:
+            recent_off_epa = off_means[team]
+            recent_def_epa = def_means.get(team, 0.0)
+            results[team] = {
+                'recent_off_epa': recent_off_epa,
+                'recent_def_epa': recent_def_epa,
+                'recent_total_epa': recent_off_epa - recent_def_epa,
+                'recent_games': int(num_games[team])
+            }
+
+        logger.debug(f"Batch recent form calculated for {len(results)} teams")
+
+        return results
+
     def calculate_situational_stats(self, offense: pd.DataFrame, defense: pd.DataFrame) -> Dict:
         """
         Calculate situational stats: 3rd down, red zone, 4th quarter, 2-minute drill.
@@ -107,41 +267,43 @@ class EPAAnalyzer:
             Dict with situational EPA metrics
         """
         stats = {}
-        
-        # 3rd down efficiency
-        off_3rd = offense[offense['down'] == 3]
-        def_3rd = defense[defense['down'] == 3]
-        
-        stats['off_3rd_epa'] = off_3rd['epa'].mean() if len(off_3rd) > 0 else 0.0
-        stats['def_3rd_epa'] = def_3rd['epa'].mean() if len(def_3rd) > 0 else 0.0
-        stats['off_3rd_conv_rate'] = (off_3rd['first_down'] == 1).mean() if len(off_3rd) > 0 else 0.0
-        stats['def_3rd_stop_rate'] = (def_3rd['first_down'] == 0).mean() if len(def_3rd) > 0 else 0.0
-        
+
+        # Shared masks/arrays, built once per frame and reused across
+        # calls and across the explosive-play calculation
+        om = self._prep_play_masks(offense)
+        dm = self._prep_play_masks(defense)
+
+        def _masked_mean(values, mask):
+            # nanmean mirrors the skipna behavior of the old pandas means
+            sel = values[mask]
+            if sel.size == 0:
+                return 0.0
+            m = np.nanmean(sel)
+            return 0.0 if np.isnan(m) else float(m)
+
+        # 3rd down efficiency — first_down/touchdown are 0/1 columns,
+        # so their mean IS the rate; no == comparison pass needed
+        stats['off_3rd_epa'] = _masked_mean(om['epa'], om['down3'])
+        stats['def_3rd_epa'] = _masked_mean(dm['epa'], dm['down3'])
+        stats['off_3rd_conv_rate'] = _masked_mean(om['fd'], om['down3'])
+        stats['def_3rd_stop_rate'] = 1.0 - _masked_mean(dm['fd'], dm['down3']) if dm['down3'].any() else 0.0
+
         # Red zone efficiency (inside 20 yard line)
-        off_redzone = offense[offense['yardline_100'] <= 20]
-        def_redzone = defense[defense['yardline_100'] <= 20]
-        
-        stats['off_redzone_epa'] = off_redzone['epa'].mean() if len(off_redzone) > 0 else 0.0
-        stats['def_redzone_epa'] = def_redzone['epa'].mean() if len(def_redzone) > 0 else 0.0
-        stats['off_redzone_td_rate'] = (off_redzone['touchdown'] == 1).mean() if len(off_redzone) > 0 else 0.0
-        stats['def_redzone_td_rate'] = (def_redzone['touchdown'] == 1).mean() if len(def_redzone) > 0 else 0.0
-        
+        stats['off_redzone_epa'] = _masked_mean(om['epa'], om['rz'])
+        stats['def_redzone_epa'] = _masked_mean(dm['epa'], dm['rz'])
+        stats['off_redzone_td_rate'] = _masked_mean(om['td'], om['rz'])
+        stats['def_redzone_td_rate'] = _masked_mean(dm['td'], dm['rz'])
+
         # 4th quarter performance
-        off_q4 = offense[offense['qtr'] == 4]
-        def_q4 = defense[defense['qtr'] == 4]
-        
-        stats['off_q4_epa'] = off_q4['epa'].mean() if len(off_q4) > 0 else 0.0
-        stats['def_q4_epa'] = def_q4['epa'].mean() if len(def_q4) > 0 else 0.0
-        
+        stats['off_q4_epa'] = _masked_mean(om['epa'], om['q4'])
+        stats['def_q4_epa'] = _masked_mean(dm['epa'], dm['q4'])
+
         # 2-minute drill (last 2 minutes of half)
-        off_2min = offense[(offense['half_seconds_remaining'] <= 120) & (offense['half_seconds_remaining'] > 0)]
-        def_2min = defense[(defense['half_seconds_remaining'] <= 120) & (defense['half_seconds_remaining'] > 0)]
-        
-        stats['off_2min_epa'] = off_2min['epa'].mean() if len(off_2min) > 0 else 0.0
-        stats['def_2min_epa'] = def_2min['epa'].mean() if len(def_2min) > 0 else 0.0
-        
+        stats['off_2min_epa'] = _masked_mean(om['epa'], om['2min'])
+        stats['def_2min_epa'] = _masked_mean(dm['epa'], dm['2min'])
+
         logger.debug(f"Situational stats: 3rd={stats['off_3rd_conv_rate']:.2%}, RZ TD={stats['off_redzone_td_rate']:.2%}")
-        
+
         return stats
     
     def calculate_explosive_plays(self, offense: pd.DataFrame, defense: pd.DataFrame) -> Dict:
@@ -155,18 +317,23 @@ class EPAAnalyzer:
         Returns:
             Dict with explosive play metrics
         """
-        off_explosive = (offense['yards_gained'] >= 20).sum()
-        def_explosive = (defense['yards_gained'] >= 20).sum()
-        
+        # Single mask per side from the shared memo, reused for count,
+        # rate, and EPA slice — no boolean Series or filtered-DataFrame
+        # temporaries
+        om = self._prep_play_masks(offense)
+        dm = self._prep_play_masks(defense)
+        off_mask = om['expl']
+        def_mask = dm['expl']
+
+        off_explosive = int(off_mask.sum())
+        def_explosive = int(def_mask.sum())
+
         off_explosive_rate = off_explosive / len(offense) if len(offense) > 0 else 0.0
         def_explosive_rate = def_explosive / len(defense) if len(defense) > 0 else 0.0
-        
+
         # EPA from explosive plays
-        off_explosive_plays = offense[offense['yards_gained'] >= 20]
-        def_explosive_plays = defense[defense['yards_gained'] >= 20]
-        
-        off_explosive_epa = off_explosive_plays['epa'].mean() if len(off_explosive_plays) > 0 else 0.0
-        def_explosive_epa = def_explosive_plays['epa'].mean() if len(def_explosive_plays) > 0 else 0.0
+        off_explosive_epa = np.nanmean(om['epa'][off_mask]) if off_mask.any() else 0.0
+        def_explosive_epa = np.nanmean(dm['epa'][def_mask]) if def_mask.any() else 0.0
         
         return {
             'off_explosive_rate': off_explosive_rate,
@@ -222,13 +389,10 @@ class EPAAnalyzer:
         Returns:
             Dict with combined weighted EPA
         """
-        full_weight = EPAConfig.FULL_SEASON_WEIGHT
-        recent_weight = EPAConfig.RECENT_FORM_WEIGHT
-        
-        combined_off_epa = (full_epa['off_epa'] * full_weight + 
-                           recent_epa['recent_off_epa'] * recent_weight)
-        combined_def_epa = (full_epa['def_epa'] * full_weight + 
-                           recent_epa['recent_def_epa'] * recent_weight)
+        combined_off_epa = (full_epa['off_epa'] * _FULL_WEIGHT +
+                           recent_epa['recent_off_epa'] * _RECENT_WEIGHT)
+        combined_def_epa = (full_epa['def_epa'] * _FULL_WEIGHT +
+                           recent_epa['recent_def_epa'] * _RECENT_WEIGHT)
         
         logger.debug(f"Combined EPA: Off={combined_off_epa:.3f}, Def={combined_def_epa:.3f}")
         
@@ -276,7 +440,35 @@ class EPAAnalyzer:
         # ~0.5% EPA boost per day of rest advantage
         rest_boost = rest_days_diff * 0.005
         adjusted = epa + rest_boost
-        
+
         logger.debug(f"Rest advantage: {rest_days_diff} days → {rest_boost:+.3f} EPA boost")
-        
+
         return adjusted
+
+    def apply_division_rivalry_vec(self, epa_diff: np.ndarray, is_division_game: np.ndarray) -> np.ndarray:
+        """
+        Vectorized division rivalry compression over a slate of games.
+
+        Args:
+            epa_diff: EPA differentials
+            is_division_game: Boolean mask of division matchups
+
+        Returns:
+            Adjusted EPA differentials
+        """
+        compression = BettingConfig.DIVISION_RIVALRY_COMPRESSION
+        return np.where(is_division_game, epa_diff * (1 - compression), epa_diff)
+
+    def apply_rest_advantage_vec(self, epa: np.ndarray, rest_days_diff: np.ndarray) -> np.ndarray:
+        """
+        Vectorized rest-differential boost over a slate of games.
+
+        Args:
+            epa: Base EPA values
+            rest_days_diff: Rest-day differentials (positive = advantage)
+
+        Returns:
+            Adjusted EPA values
+        """
+        # ~0.5% EPA boost per day of rest advantage
+        return epa + 0.005 * np.asarray(rest_days_diff)
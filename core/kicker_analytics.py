@@ -13,83 +13,172 @@ from logger import get_logger
 
 logger = get_logger(__name__)
 
+# Distance ranges flattened once at import for searchsorted bucketing
+# (ranges are contiguous and sorted by min distance in the config)
+_RANGE_NAMES = tuple(KickerConfig.DISTANCE_RANGES)
+_RANGE_EDGES = np.array([lo for lo, _ in KickerConfig.DISTANCE_RANGES.values()], dtype=np.float64)
+_RANGE_MAXES = np.array([hi for _, hi in KickerConfig.DISTANCE_RANGES.values()], dtype=np.float64)
 
-def calculate_kicker_stats(pbp: pd.DataFrame, team: str) -> Dict[str, float]:
+# League-average fallbacks, resolved at import — no class-attribute +
+# dict lookup chain inside the per-range loop
+_LEAGUE_AVG = KickerConfig.LEAGUE_AVG_FG_PCT
+_LEAGUE_MED = _LEAGUE_AVG['medium']
+_LEAGUE_LONG = _LEAGUE_AVG['long']
+
+# Weather penalty thresholds, bound once for the vectorized adjuster
+_W_HIGH = KickerConfig.WEATHER_PENALTY['wind_high']
+_W_EXTREME = KickerConfig.WEATHER_PENALTY['wind_extreme']
+_T_COLD = KickerConfig.WEATHER_PENALTY['cold']
+_T_EXTREME = KickerConfig.WEATHER_PENALTY['extreme_cold']
+_PRECIP = KickerConfig.WEATHER_PENALTY['precipitation']
+
+# FG-split memo for the session's play-by-play frame: the full-frame
+# scan + groupby runs once and every per-team stats call reuses it
+# (identity check, same pattern as the data-loader memo caches)
+_fg_splits_src: Optional[pd.DataFrame] = None
+_fg_splits: Dict[str, pd.DataFrame] = {}
+
+# Per-team stats memo, valid for the same session frame as the splits
+_stats_cache: Dict[str, Dict[str, float]] = {}
+
+
+def clear_cache():
+    """Drop the FG splits and per-team stats memos (new data loaded)."""
+    global _fg_splits_src, _fg_splits
+    _fg_splits_src = None
+    _fg_splits = {}
+    _stats_cache.clear()
+
+
+def precompute_fg_splits(pbp: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Split field-goal attempts by team in one pass over the frame.
+
+    Calling calculate_kicker_stats for every team used to re-scan the
+    whole play-by-play frame 32 times; one filter + groupby amortizes
+    that to a single scan.
+
+    Args:
+        pbp: Play-by-play DataFrame
+
+    Returns:
+        Dict mapping team abbreviation to its FG-attempt plays
+    """
+    global _fg_splits_src, _fg_splits
+    if pbp is _fg_splits_src:
+        return _fg_splits
+
+    fg_only = pbp[pbp['field_goal_attempt'] == 1]
+    _fg_splits = {team: plays for team, plays in fg_only.groupby('posteam', sort=False, observed=True)}
+    _fg_splits_src = pbp
+    _stats_cache.clear()
+    return _fg_splits
+
+
+def _made_mask(field_goal_result: pd.Series) -> np.ndarray:
+    """
+    Boolean made-FG mask, comparing category codes when available.
+
+    The loader ingests field_goal_result as a categorical, so equality
+    is an int8 code compare instead of a per-row string compare; plain
+    object columns fall back to the string comparison.
+    """
+    if isinstance(field_goal_result.dtype, pd.CategoricalDtype):
+        categories = field_goal_result.cat.categories
+        if 'made' not in categories:
+            return np.zeros(len(field_goal_result), dtype=bool)
+        made_code = categories.get_loc('made')
+        return field_goal_result.cat.codes.to_numpy() == made_code
+    return field_goal_result.to_numpy() == 'made'
+
+
+def calculate_kicker_stats(pbp: pd.DataFrame, team: str,
+                           team_fgs: Optional[pd.DataFrame] = None) -> Dict[str, float]:
     """
     Calculate team kicker stats from play-by-play data.
-    
+
     Args:
         pbp: Play-by-play DataFrame
         team: Team abbreviation
-        
+        team_fgs: Precomputed FG attempts for this team (optional;
+            looked up via precompute_fg_splits when absent)
+
     Returns:
         Dict with FG% by distance range and overall stats
     """
     if not KickerConfig.ENABLED:
         return {}
-    
+
     # Check if required columns exist
     required_cols = ['posteam', 'field_goal_attempt', 'kick_distance', 'field_goal_result']
     missing_cols = [col for col in required_cols if col not in pbp.columns]
     if missing_cols:
         logger.warning(f"Missing kicker columns for {team}: {missing_cols}. Using defaults.")
         return _default_kicker_stats()
-    
-    # Filter to field goal attempts by this team
-    try:
-        team_fgs = pbp[
-            (pbp['posteam'] == team) & 
-            (pbp['field_goal_attempt'] == 1)
-        ].copy()
-    except Exception as e:
-        logger.warning(f"Error filtering FG data for {team}: {e}")
-        return _default_kicker_stats()
-    
-    if len(team_fgs) == 0:
+
+    # Look up this team's FG attempts from the one-pass splits; the
+    # finished stats dict is memoized per team for the session frame
+    from_splits = team_fgs is None
+    if from_splits:
+        if pbp is _fg_splits_src and team in _stats_cache:
+            return _stats_cache[team]
+        try:
+            team_fgs = precompute_fg_splits(pbp).get(team)
+        except Exception as e:
+            logger.warning(f"Error filtering FG data for {team}: {e}")
+            return _default_kicker_stats()
+
+    if team_fgs is None or len(team_fgs) == 0:
         logger.debug(f"No FG attempts found for {team}")
         return _default_kicker_stats()
     
     stats = {}
-    
-    # Calculate FG% by distance range
-    for range_name, (min_dist, max_dist) in KickerConfig.DISTANCE_RANGES.items():
-        range_fgs = team_fgs[
-            (team_fgs['kick_distance'] >= min_dist) & 
-            (team_fgs['kick_distance'] <= max_dist)
-        ]
-        
-        if len(range_fgs) > 0:
-            makes = (range_fgs['field_goal_result'] == 'made').sum()
-            attempts = len(range_fgs)
-            pct = makes / attempts
-            stats[f'fg_pct_{range_name}'] = pct
-            stats[f'fg_attempts_{range_name}'] = attempts
+
+    # FG% by distance range in one pass: bucketize distances against
+    # the precomputed range edges, then bincount attempts and makes —
+    # no per-range boolean filter or intermediate frame
+    dist = team_fgs['kick_distance'].to_numpy(dtype=np.float64)
+    made = _made_mask(team_fgs['field_goal_result'])
+
+    bucket = np.searchsorted(_RANGE_EDGES, dist, side='right') - 1
+    valid = (bucket >= 0) & (dist <= _RANGE_MAXES[np.clip(bucket, 0, len(_RANGE_NAMES) - 1)])
+
+    attempts_b = np.bincount(bucket[valid], minlength=len(_RANGE_NAMES))
+    makes_b = np.bincount(bucket[valid], weights=made[valid], minlength=len(_RANGE_NAMES))
+
+    for i, range_name in enumerate(_RANGE_NAMES):
+        if attempts_b[i] > 0:
+            stats[f'fg_pct_{range_name}'] = makes_b[i] / attempts_b[i]
+            stats[f'fg_attempts_{range_name}'] = int(attempts_b[i])
         else:
             # Use league average if no attempts
-            stats[f'fg_pct_{range_name}'] = KickerConfig.LEAGUE_AVG_FG_PCT.get(range_name, 0.80)
+            stats[f'fg_pct_{range_name}'] = _LEAGUE_AVG.get(range_name, 0.80)
             stats[f'fg_attempts_{range_name}'] = 0
-    
+
     # Overall FG%
-    total_makes = (team_fgs['field_goal_result'] == 'made').sum()
+    total_makes = made.sum()
     total_attempts = len(team_fgs)
     stats['fg_pct_overall'] = total_makes / total_attempts if total_attempts > 0 else 0.85
     stats['fg_attempts_total'] = total_attempts
     
-    # Clutch performance (4Q or OT)
-    clutch_fgs = team_fgs[
-        ((team_fgs['qtr'] == 4) | (team_fgs['qtr'] == 5)) &
-        (team_fgs['score_differential'].abs() <= 8)  # Within one score
-    ]
-    
-    if len(clutch_fgs) > 3:  # Need minimum sample
-        clutch_makes = (clutch_fgs['field_goal_result'] == 'made').sum()
-        clutch_attempts = len(clutch_fgs)
-        stats['fg_pct_clutch'] = clutch_makes / clutch_attempts
+    # Clutch performance (4Q or OT) — reuse the made array computed
+    # above and count through numpy masks; no filtered frame and no
+    # second per-row string comparison
+    qtr = team_fgs['qtr'].to_numpy()
+    score_diff = team_fgs['score_differential'].to_numpy()
+    clutch = ((qtr == 4) | (qtr == 5)) & (np.abs(score_diff) <= 8)  # Within one score
+
+    clutch_attempts = int(clutch.sum())
+    if clutch_attempts > 3:  # Need minimum sample
+        stats['fg_pct_clutch'] = int(made[clutch].sum()) / clutch_attempts
         stats['clutch_attempts'] = clutch_attempts
     else:
         stats['fg_pct_clutch'] = stats['fg_pct_overall']
-        stats['clutch_attempts'] = len(clutch_fgs)
-    
+        stats['clutch_attempts'] = clutch_attempts
+
+    if from_splits and pbp is _fg_splits_src:
+        _stats_cache[team] = stats
+
     return stats
 
 
@@ -146,10 +235,37 @@ def adjust_for_weather(
         penalty += KickerConfig.WEATHER_PENALTY['precipitation']
     
     adjusted_pct = max(0.0, base_fg_pct - penalty)
-    
+
     return adjusted_pct
 
 
+def adjust_for_weather_vec(
+    base_pct: np.ndarray,
+    temp: np.ndarray,
+    wind: np.ndarray,
+    precip: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized weather adjustment over a slate of games.
+
+    Same thresholds as adjust_for_weather, evaluated as three np.where
+    chains instead of per-game Python branch cascades.
+
+    Args:
+        base_pct: Base field goal percentages
+        temp: Temperatures (°F)
+        wind: Wind speeds (mph)
+        precip: Precipitation indicators
+
+    Returns:
+        Weather-adjusted FG% array
+    """
+    pen = np.where(wind > 25, _W_EXTREME, np.where(wind > 15, _W_HIGH, 0.0))
+    pen = pen + np.where(temp < 20, _T_EXTREME, np.where(temp < 32, _T_COLD, 0.0))
+    pen = pen + np.where(np.asarray(precip) > 0, _PRECIP, 0.0)
+    return np.maximum(0.0, np.asarray(base_pct) - pen)
+
+
 def calculate_kicker_advantage(
     home_stats: Dict[str, float],
     away_stats: Dict[str, float],
@@ -171,18 +287,13 @@ def calculate_kicker_advantage(
     if not KickerConfig.ENABLED or not home_stats or not away_stats:
         return 0.0, {}
     
-    # Focus on medium and long range (40+ yards) - most impactful
-    critical_ranges = ['medium', 'long']
-    
-    home_avg_pct = np.mean([
-        home_stats.get(f'fg_pct_{r}', KickerConfig.LEAGUE_AVG_FG_PCT[r])
-        for r in critical_ranges
-    ])
-    
-    away_avg_pct = np.mean([
-        away_stats.get(f'fg_pct_{r}', KickerConfig.LEAGUE_AVG_FG_PCT[r])
-        for r in critical_ranges
-    ])
+    # Focus on medium and long range (40+ yards) - most impactful.
+    # Plain scalar average of the two ranges: np.mean on a 2-element
+    # list costs array allocation + ufunc dispatch per call
+    home_avg_pct = 0.5 * (home_stats.get('fg_pct_medium', _LEAGUE_MED)
+                          + home_stats.get('fg_pct_long', _LEAGUE_LONG))
+    away_avg_pct = 0.5 * (away_stats.get('fg_pct_medium', _LEAGUE_MED)
+                          + away_stats.get('fg_pct_long', _LEAGUE_LONG))
     
     # Adjust for weather
     home_adj_pct = adjust_for_weather(home_avg_pct, weather)
@@ -301,23 +412,28 @@ TEAM_KICKERS_2025 = {
 }
 
 
+TIER_ADJUSTMENTS = {
+    'elite': 0.008,       # Tucker, Butker level
+    'above_avg': 0.004,   # Solid veteran
+    'average': 0.0,
+    'below_avg': -0.004,
+    'poor': -0.008
+}
+
+# Team → EPA adjustment, flattened once at import so the lookup is a
+# single dict get per call
+TEAM_KICKER_EPA = {
+    team: TIER_ADJUSTMENTS.get(info['tier'], 0.0)
+    for team, info in TEAM_KICKERS_2025.items()
+}
+
+
 def get_kicker_tier_adjustment(team: str) -> float:
     """
     Manual tier adjustment for known elite/poor kickers.
     Use when play-by-play data is insufficient.
-    
+
     Returns:
         EPA adjustment (-0.01 to +0.01)
     """
-    kicker_info = TEAM_KICKERS_2025.get(team, {'tier': 'average'})
-    tier = kicker_info['tier']
-    
-    tier_adjustments = {
-        'elite': 0.008,       # Tucker, Butker level
-        'above_avg': 0.004,   # Solid veteran
-        'average': 0.0,
-        'below_avg': -0.004,
-        'poor': -0.008
-    }
-    
-    return tier_adjustments.get(tier, 0.0)
+    return TEAM_KICKER_EPA.get(team, 0.0)
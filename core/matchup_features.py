@@ -18,92 +18,229 @@ from logger import get_logger
 
 logger = get_logger(__name__)
 
+# Config weights are constants, so the enabled check (including the
+# "all caps zeroed" production-off configuration) is resolved once at
+# import instead of once per helper per prediction
+_ZERO = {"home": 0.0, "away": 0.0}
+_ADV_ENABLED = AdvancedWeights.ENABLED and any((
+    AdvancedWeights.MAX_EPA_OL_DL,
+    AdvancedWeights.MAX_EPA_COVERAGE_FIT,
+    AdvancedWeights.MAX_EPA_PACE,
+    AdvancedWeights.MAX_EPA_SPECIAL_TEAMS,
+    AdvancedWeights.MAX_EPA_MOMENTUM,
+    AdvancedWeights.MAX_EPA_TOTAL,
+))
+
+
+def precompute_team_arrays(df: pd.DataFrame) -> Dict:
+    """
+    Pull the columns the matchup helpers share into raw numpy arrays.
 
-def _safe_mean(series: pd.Series, default: float = 0.0) -> float:
-    try:
-        if len(series) == 0:
-            return default
-        return float(series.mean())
-    except Exception:
-        return default
+    aggregate_advanced calls the helpers back-to-back on the same
+    frames; one to_numpy per column here replaces a fresh pandas mask
+    (bool ndarray + Series wrapper) per helper per call.
+    """
+    # float32 is exact for these columns (0/1 flags, quarter-yard
+    # gains) and halves the bytes the comparison scans pull through —
+    # the helpers only ever compare these arrays, never accumulate them
+    return {
+        'n': len(df),
+        'pass': df['pass'].to_numpy(dtype=np.float32) if 'pass' in df.columns else None,
+        'sack': df['sack'].to_numpy(dtype=np.float32) if 'sack' in df.columns else None,
+        'has_qb_hit': 'qb_hit' in df.columns,
+        'yards': df['yards_gained'].to_numpy(dtype=np.float32) if 'yards_gained' in df.columns else None,
+        # pd.unique on the raw ndarray skips the Series nunique path
+        # (boxing + dropna) — game ids are strings, so the hash-based
+        # dedupe also beats a sorting np.unique
+        'games': len(pd.unique(df['game_id'].to_numpy())) if 'game_id' in df.columns else 1,
+    }
+
+
+def _sack_rate(arrs: Dict) -> float:
+    """Sacks per dropback from precomputed arrays (pressure proxy)."""
+    if arrs['sack'] is None and not arrs['has_qb_hit']:
+        return 0.0
+    dropbacks = int((arrs['pass'] == 1).sum()) if arrs['pass'] is not None else 0
+    sacks = int((arrs['sack'] == 1).sum()) if arrs['sack'] is not None else 0
+    return (sacks / dropbacks) if dropbacks > 0 else 0.0
+
+
+def _explosive_pass_rate(arrs: Dict) -> float:
+    """Share of pass plays gaining 20+ yards, from precomputed arrays.
+
+    Fused predicate: count pass-and-explosive in one combined mask
+    rather than slicing the yards array per call.
+    """
+    if arrs['pass'] is None or arrs['yards'] is None:
+        return 0.0
+    pm = arrs['pass'] == 1
+    denom = int(np.count_nonzero(pm))
+    if denom == 0:
+        return 0.0
+    return np.count_nonzero(pm & (arrs['yards'] >= 20)) / denom
+
+
+def _plays_per_game(arrs: Dict) -> float:
+    """Plays per game from precomputed arrays."""
+    return arrs['n'] / max(1, arrs['games'])
 
 
 def ol_dl_passrush_mismatch(home_off: pd.DataFrame, home_def: pd.DataFrame,
-                             away_off: pd.DataFrame, away_def: pd.DataFrame) -> Dict[str, float]:
+                             away_off: pd.DataFrame, away_def: pd.DataFrame,
+                             home_off_arrs: Dict | None = None,
+                             away_off_arrs: Dict | None = None) -> Dict[str, float]:
     """
     Proxy pass-rush mismatch using sack rate per dropback.
     Uses pbp flags if available; otherwise returns 0.
     Returns small EPA deltas for offense vs opponent pass rush.
     """
+    if not _ADV_ENABLED:
+        return dict(_ZERO)
     deltas = {"home": 0.0, "away": 0.0}
-    if not AdvancedWeights.ENABLED:
-        return deltas
-    
-    # Heuristic: sacks per dropback as proxy for pressure
-    def sack_rate(off: pd.DataFrame) -> float:
-        if 'qb_hit' in off.columns or 'sack' in off.columns:
-            dropbacks = (off['pass'] == 1).sum() if 'pass' in off.columns else 0
-            sacks = (off.get('sack', pd.Series([0]*len(off))) == 1).sum()
-            return (sacks / dropbacks) if dropbacks > 0 else 0.0
-        return 0.0
 
-    home_sack_rate = sack_rate(home_off)
-    away_sack_rate = sack_rate(away_off)
+    # Heuristic: sacks per dropback as proxy for pressure
+    home_sack_rate = _sack_rate(home_off_arrs or precompute_team_arrays(home_off))
+    away_sack_rate = _sack_rate(away_off_arrs or precompute_team_arrays(away_off))
 
     # Relative disadvantage converts to tiny EPA penalties
     # 5% sack-rate gap ~ 0.01 EPA impact
     scale = 0.2
-    home_delta = np.clip((away_sack_rate - home_sack_rate) * scale, -AdvancedWeights.MAX_EPA_OL_DL, AdvancedWeights.MAX_EPA_OL_DL)
-    away_delta = np.clip((home_sack_rate - away_sack_rate) * scale, -AdvancedWeights.MAX_EPA_OL_DL, AdvancedWeights.MAX_EPA_OL_DL)
-
-    deltas["home"] += float(home_delta)
-    deltas["away"] += float(away_delta)
+    cap = AdvancedWeights.MAX_EPA_OL_DL
+    # Plain min/max on scalars — np.clip routes one float through the
+    # full ufunc machinery
+    home_delta = max(-cap, min(cap, (away_sack_rate - home_sack_rate) * scale))
+    away_delta = max(-cap, min(cap, (home_sack_rate - away_sack_rate) * scale))
+
+    deltas["home"] += home_delta
+    deltas["away"] += away_delta
     return deltas
 
 
-def _per_game_total_epa(team_all: pd.DataFrame, team: str) -> pd.DataFrame:
-    off = team_all[team_all['posteam'] == team]
-    deff = team_all[team_all['defteam'] == team]
-    off_g = off.groupby('game_id')['epa'].mean()
-    def_g = deff.groupby('game_id')['epa'].mean()
-    # Align indices
-    all_ids = sorted(set(off_g.index).union(def_g.index))
-    off_series = off_g.reindex(all_ids).fillna(0)
-    def_series = def_g.reindex(all_ids).fillna(0)
-    total = off_series - def_series
-    df = total.to_frame('total_epa')
-    # If week exists, use it for ordering
+# Memoized per-game EPA series, keyed by (team, frame identity) with
+# the frame kept as a strong reference and verified via `is` — the same
+# pattern the analyzers use. Bounded so batch runs that build a fresh
+# team slice per prediction cannot grow it without limit.
+_per_game_cache: Dict = {}
+_PER_GAME_CACHE_MAX = 64
+
+
+def _per_game_total_epa(team_all: pd.DataFrame, team: str) -> np.ndarray:
+    """
+    Per-game (off EPA mean − def EPA mean), ordered by week.
+
+    One factorize plus four bincounts over raw arrays replaces the old
+    two-groupby / reindex / fillna / drop_duplicates / sort_values
+    chain — no intermediate frames, called twice per prediction.
+    Results are memoized per (team, frame), so scenario loops that
+    re-predict matchups over the same slice skip the recompute.
+    """
+    key = (team, id(team_all))
+    hit = _per_game_cache.get(key)
+    if hit is not None and hit[0] is team_all:
+        return hit[1]
+
+    total = _per_game_total_epa_impl(team_all, team)
+
+    if len(_per_game_cache) >= _PER_GAME_CACHE_MAX:
+        # Capture-then-pop with a default: the card runner predicts
+        # from a thread pool, so a concurrent eviction may have
+        # already removed (or emptied past) the oldest entry
+        stale = next(iter(_per_game_cache), None)
+        if stale is not None:
+            _per_game_cache.pop(stale, None)
+    _per_game_cache[key] = (team_all, total)
+    return total
+
+
+def _per_game_total_epa_impl(team_all: pd.DataFrame, team: str) -> np.ndarray:
+    codes, _ = pd.factorize(team_all['game_id'], sort=True)
+    n_games = codes.max() + 1 if len(codes) else 0
+    if n_games == 0:
+        return np.empty(0, dtype=np.float64)
+
+    epa = team_all['epa'].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(epa)
+    off = (team_all['posteam'].to_numpy() == team) & valid
+    deff = (team_all['defteam'].to_numpy() == team) & valid
+
+    off_sum = np.bincount(codes[off], weights=epa[off], minlength=n_games)
+    off_cnt = np.bincount(codes[off], minlength=n_games)
+    def_sum = np.bincount(codes[deff], weights=epa[deff], minlength=n_games)
+    def_cnt = np.bincount(codes[deff], minlength=n_games)
+
+    total = (np.where(off_cnt > 0, off_sum / np.maximum(off_cnt, 1), 0.0)
+             - np.where(def_cnt > 0, def_sum / np.maximum(def_cnt, 1), 0.0))
+
+    # Order by week (first row per game), ties by total — same order
+    # the old sort_values produced
     if 'week' in team_all.columns:
-        week_map = team_all.drop_duplicates(subset=['game_id']).set_index('game_id')['week']
-        df['week'] = week_map.reindex(df.index)
-        df = df.sort_values(by=['week', 'total_epa'])
-    return df
+        _, first_idx = np.unique(codes, return_index=True)
+        week_of_game = team_all['week'].to_numpy()[first_idx]
+        total = total[np.lexsort((total, week_of_game))]
+    return total
+
+
+def momentum_trajectory(team: str, team_all: pd.DataFrame,
+                        window: int | None = None) -> np.ndarray:
+    """
+    Moving average of per-game total EPA across the season.
+
+    One cumulative sum gives every window position in O(n), so callers
+    evaluating form week by week (scenario sims, dashboards) read the
+    whole trajectory in one shot instead of re-slicing per week. Reuses
+    the memoized per-game series from epa_momentum_delta.
+
+    Args:
+        team: Team abbreviation
+        team_all: All plays involving the team
+        window: Games per window (defaults to MOMENTUM_WINDOW)
+
+    Returns:
+        Array of window means, one per window position (empty if the
+        team has fewer games than the window)
+    """
+    n = window if window is not None else AdvancedWeights.MOMENTUM_WINDOW
+    vals = _per_game_total_epa(team_all, team)
+    if n < 1 or len(vals) < n:
+        return np.empty(0, dtype=np.float64)
+    cs = np.cumsum(vals)
+    return (cs[n - 1:] - np.concatenate(([0.0], cs[:-n]))) / n
 
 
 def epa_momentum_delta(team: str, team_all: pd.DataFrame, away: bool = False) -> Dict[str, float]:
+    if not _ADV_ENABLED:
+        return dict(_ZERO)
     deltas = {"home": 0.0, "away": 0.0}
-    if not AdvancedWeights.ENABLED:
-        return deltas
+    # Bound config attributes once — this runs twice per prediction
+    # and the class-attribute lookups add up
+    w = AdvancedWeights
     try:
-        df = _per_game_total_epa(team_all, team)
-        vals = df['total_epa'].values
+        vals = _per_game_total_epa(team_all, team)
         if len(vals) < 2:
             return deltas
         # Overall mean and recent mean
         overall = float(np.nanmean(vals))
-        n = AdvancedWeights.MOMENTUM_WINDOW
+        n = w.MOMENTUM_WINDOW
         recent_vals = vals[-n:] if len(vals) >= n else vals
         recent_mean = float(np.nanmean(recent_vals))
-        recent_vs_season = (recent_mean - overall) * AdvancedWeights.MOMENTUM_RECENT_VS_SEASON_SCALE
-        # Slope trend
-        x = np.arange(len(recent_vals))
-        slope = float(np.polyfit(x, recent_vals[-len(x):], 1)[0]) if len(x) >= 2 else 0.0
-        slope_scaled = slope * AdvancedWeights.MOMENTUM_SLOPE_SCALE
-        delta = np.clip(recent_vs_season + slope_scaled,
-                        -AdvancedWeights.MAX_EPA_MOMENTUM,
-                        AdvancedWeights.MAX_EPA_MOMENTUM)
+        recent_vs_season = (recent_mean - overall) * w.MOMENTUM_RECENT_VS_SEASON_SCALE
+        # Slope trend — closed-form OLS over x = 0..n-1; a degree-1
+        # polyfit spins up a Vandermonde matrix and an SVD for the
+        # same number
+        m = len(recent_vals)
+        if m >= 2:
+            sx = (m - 1) * m / 2
+            sxx = (m - 1) * m * (2 * m - 1) / 6
+            sy = float(recent_vals.sum())
+            sxy = float((np.arange(m) * recent_vals).sum())
+            slope = (m * sxy - sx * sy) / (m * sxx - sx * sx)
+        else:
+            slope = 0.0
+        slope_scaled = slope * w.MOMENTUM_SLOPE_SCALE
+        cap = w.MAX_EPA_MOMENTUM
+        delta = max(-cap, min(cap, recent_vs_season + slope_scaled))
         key = 'away' if away else 'home'
-        deltas[key] += float(delta)
+        deltas[key] += delta
         return deltas
     except Exception as e:
         logger.debug(f"momentum calc error for {team}: {e}")
@@ -111,71 +248,60 @@ def epa_momentum_delta(team: str, team_all: pd.DataFrame, away: bool = False) ->
 
 
 def coverage_wr_fit(home_off: pd.DataFrame, away_def: pd.DataFrame,
-                    away_off: pd.DataFrame, home_def: pd.DataFrame) -> Dict[str, float]:
+                    away_off: pd.DataFrame, home_def: pd.DataFrame,
+                    home_off_arrs: Dict | None = None,
+                    away_def_arrs: Dict | None = None,
+                    away_off_arrs: Dict | None = None,
+                    home_def_arrs: Dict | None = None) -> Dict[str, float]:
     """
     Proxy coverage-vs-WR explosive fit via explosive pass rate vs explosive-pass allowed.
     """
+    if not _ADV_ENABLED:
+        return dict(_ZERO)
     deltas = {"home": 0.0, "away": 0.0}
-    if not AdvancedWeights.ENABLED:
-        return deltas
-
-    def explosive_pass_rate(df: pd.DataFrame) -> float:
-        if 'pass' in df.columns and 'yards_gained' in df.columns:
-            mask = (df['pass'] == 1)
-            plays = df[mask]
-            if len(plays) == 0:
-                return 0.0
-            return (plays['yards_gained'] >= 20).mean()
-        return 0.0
 
-    home_explosive = explosive_pass_rate(home_off)
-    away_explosive = explosive_pass_rate(away_off)
-
-    def allowed_explosive(def_df: pd.DataFrame) -> float:
-        if 'yards_gained' in def_df.columns and 'pass' in def_df.columns:
-            plays = def_df[def_df['pass'] == 1]
-            if len(plays) == 0:
-                return 0.0
-            return (plays['yards_gained'] >= 20).mean()
-        return 0.0
+    home_explosive = _explosive_pass_rate(home_off_arrs or precompute_team_arrays(home_off))
+    away_explosive = _explosive_pass_rate(away_off_arrs or precompute_team_arrays(away_off))
 
-    home_def_allowed = allowed_explosive(home_def)
-    away_def_allowed = allowed_explosive(away_def)
+    # Explosive passes allowed: same rate, over the defensive plays
+    home_def_allowed = _explosive_pass_rate(home_def_arrs or precompute_team_arrays(home_def))
+    away_def_allowed = _explosive_pass_rate(away_def_arrs or precompute_team_arrays(away_def))
 
     # Fit advantage: offense explosive vs opponent allowed
     home_fit = home_explosive - away_def_allowed
     away_fit = away_explosive - home_def_allowed
 
     scale = 0.05  # small
-    home_delta = np.clip(home_fit * scale, -AdvancedWeights.MAX_EPA_COVERAGE_FIT, AdvancedWeights.MAX_EPA_COVERAGE_FIT)
-    away_delta = np.clip(away_fit * scale, -AdvancedWeights.MAX_EPA_COVERAGE_FIT, AdvancedWeights.MAX_EPA_COVERAGE_FIT)
+    cap = AdvancedWeights.MAX_EPA_COVERAGE_FIT
+    home_delta = max(-cap, min(cap, float(home_fit) * scale))
+    away_delta = max(-cap, min(cap, float(away_fit) * scale))
 
-    deltas["home"] += float(home_delta)
-    deltas["away"] += float(away_delta)
+    deltas["home"] += home_delta
+    deltas["away"] += away_delta
     return deltas
 
 
-def pace_plays_adjustment(home_all: pd.DataFrame, away_all: pd.DataFrame) -> Dict[str, float]:
+def pace_plays_adjustment(home_all: pd.DataFrame, away_all: pd.DataFrame,
+                          home_all_arrs: Dict | None = None,
+                          away_all_arrs: Dict | None = None) -> Dict[str, float]:
     """
     Estimate pace via plays-per-game proxies (last N games not implemented here).
     If pace slower than average, slightly compress advantages.
     """
+    if not _ADV_ENABLED:
+        return dict(_ZERO)
     deltas = {"home": 0.0, "away": 0.0}
-    if not AdvancedWeights.ENABLED:
-        return deltas
-
-    def plays_per_game(df: pd.DataFrame) -> float:
-        games = df['game_id'].nunique() if 'game_id' in df.columns else 1
-        return len(df) / max(1, games)
 
     league_avg = 125.0  # combined plays/game rough avg
-    combined = (plays_per_game(home_all) + plays_per_game(away_all))
+    combined = (_plays_per_game(home_all_arrs or precompute_team_arrays(home_all))
+                + _plays_per_game(away_all_arrs or precompute_team_arrays(away_all)))
     # If combined plays low, reduce edge slightly (defenses benefit)
     diff = (combined - league_avg) / league_avg
-    compress = np.clip(-diff * 0.01, -AdvancedWeights.MAX_EPA_PACE, AdvancedWeights.MAX_EPA_PACE)
+    cap = AdvancedWeights.MAX_EPA_PACE
+    compress = max(-cap, min(cap, -diff * 0.01))
 
-    deltas["home"] += float(compress/2)
-    deltas["away"] += float(compress/2)
+    deltas["home"] += compress/2
+    deltas["away"] += compress/2
     return deltas
 
 
@@ -183,9 +309,9 @@ def special_teams_adjustment(temp_f: float | None = None, wind_mph: float | None
     """
     Small kick game adjustment penalty in cold/windy games (hurts total scoring, split).
     """
+    if not _ADV_ENABLED:
+        return dict(_ZERO)
     deltas = {"home": 0.0, "away": 0.0}
-    if not AdvancedWeights.ENABLED:
-        return deltas
 
     penalty = 0.0
     if temp_f is not None and temp_f < 25:
@@ -193,7 +319,8 @@ def special_teams_adjustment(temp_f: float | None = None, wind_mph: float | None
     if wind_mph is not None and wind_mph > 18:
         penalty -= 0.004
 
-    penalty = float(np.clip(penalty, -AdvancedWeights.MAX_EPA_SPECIAL_TEAMS, AdvancedWeights.MAX_EPA_SPECIAL_TEAMS))
+    cap = AdvancedWeights.MAX_EPA_SPECIAL_TEAMS
+    penalty = max(-cap, min(cap, penalty))
     deltas["home"] += penalty/2
     deltas["away"] += penalty/2
     return deltas
@@ -207,14 +334,24 @@ def aggregate_advanced(home_team: str, away_team: str,
     """
     Compute sum of advanced deltas with total cap across factors.
     """
+    if not _ADV_ENABLED:
+        return dict(_ZERO)
     deltas = {"home": 0.0, "away": 0.0}
-    if not AdvancedWeights.ENABLED:
-        return deltas
+
+    # Shared column arrays, pulled once and threaded through the helpers
+    home_off_arrs = precompute_team_arrays(home_off)
+    away_off_arrs = precompute_team_arrays(away_off)
+    home_def_arrs = precompute_team_arrays(home_def)
+    away_def_arrs = precompute_team_arrays(away_def)
+    home_all_arrs = precompute_team_arrays(home_all)
+    away_all_arrs = precompute_team_arrays(away_all)
 
     parts = []
-    parts.append(ol_dl_passrush_mismatch(home_off, home_def, away_off, away_def))
-    parts.append(coverage_wr_fit(home_off, away_def, away_off, home_def))
-    parts.append(pace_plays_adjustment(home_all, away_all))
+    parts.append(ol_dl_passrush_mismatch(home_off, home_def, away_off, away_def,
+                                         home_off_arrs, away_off_arrs))
+    parts.append(coverage_wr_fit(home_off, away_def, away_off, home_def,
+                                 home_off_arrs, away_def_arrs, away_off_arrs, home_def_arrs))
+    parts.append(pace_plays_adjustment(home_all, away_all, home_all_arrs, away_all_arrs))
 
     # Momentum ("hot hand") based on per-game total EPA trend and recent-vs-season diff
     parts.append(epa_momentum_delta(home_team, home_all))
@@ -2,8 +2,10 @@
 Main NFL prediction engine orchestrating all components.
 """
 
+import logging
+import math
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import numpy as np
 
 from .data_loader import NFLDataLoader
@@ -18,6 +20,9 @@ from logger import get_logger
 
 logger = get_logger(__name__)
 
+# O(1) membership for the per-prediction altitude check (config keeps a list)
+_ALTITUDE_TEAMS = frozenset(TeamsConfig.ALTITUDE_TEAMS)
+
 
 class NFLPredictor:
     """Main prediction engine combining EPA, betting analysis, and contextual factors."""
@@ -61,12 +66,24 @@ class NFLPredictor:
         Returns:
             Complete prediction dictionary
         """
-        logger.info(f"\n{'='*80}\nPREDICTION: {away_team} @ {home_team}\n{'='*80}")
-        
+        # Skip f-string formatting entirely when INFO is filtered out —
+        # this method builds a dozen formatted strings per call
+        _info = logger.isEnabledFor(logging.INFO)
+        if _info:
+            logger.info(f"\n{'='*80}\nPREDICTION: {away_team} @ {home_team}\n{'='*80}")
+
         # Validate inputs
         validate_team(home_team)
         validate_team(away_team)
-        
+
+        # Bind hot config attributes to locals once — this method does
+        # dozens of class-attribute reads per call otherwise
+        home_field_epa = BettingConfig.HOME_FIELD_EPA
+        cap_fan = EPAConfig.CAP_FAN_NOISE_EPA
+        cap_rest = EPAConfig.CAP_REST_EPA
+        cap_injury = EPAConfig.CAP_INJURY_PER_TEAM_EPA
+        cap_weather = EPAConfig.CAP_WEATHER_EPA
+
         # Load data
         pbp = self.data_loader.load_play_by_play()
         
@@ -79,7 +96,8 @@ class NFLPredictor:
         away_epa = self.epa_analyzer.calculate_team_epa(away_off, away_def)
         base_full_season_diff = home_epa['total_epa'] - away_epa['total_epa']
         
-        logger.info(f"{home_team} EPA: {home_epa['total_epa']:+.3f} | {away_team} EPA: {away_epa['total_epa']:+.3f}")
+        if _info:
+            logger.info(f"{home_team} EPA: {home_epa['total_epa']:+.3f} | {away_team} EPA: {away_epa['total_epa']:+.3f}")
         
         # Calculate recent form
         home_recent = self.data_loader.get_recent_games(home_team, EPAConfig.RECENT_GAMES, pbp)
@@ -103,54 +121,60 @@ class NFLPredictor:
             alpha = CalibrationConfig.RECENT_SHRINK_ALPHA
             home_comb_total = (1 - alpha) * home_comb_total + alpha * home_epa['total_epa']
             away_comb_total = (1 - alpha) * away_comb_total + alpha * away_epa['total_epa']
-        home_total_epa = home_comb_total
-        away_total_epa = away_comb_total
-        
         # Base EPA differential (for EPA-dominant clamp)
-        base_epa_diff = home_total_epa - away_total_epa
-        
+        base_epa_diff = home_comb_total - away_comb_total
+
+        # Each adjustment appends a (home_delta, away_delta) pair to
+        # `deltas` instead of mutating the running totals; the totals
+        # are applied once, after all branches, with a single pair of
+        # sums. `adjustments` keeps its old per-factor entries.
+        deltas = []
         adjustments = {}
-        
+
         # Home field advantage
-        home_field_epa = BettingConfig.HOME_FIELD_EPA
-        home_total_epa += home_field_epa
+        deltas.append((home_field_epa, 0.0))
         adjustments['home_field'] = home_field_epa
-        logger.info(f"Home field advantage: +{home_field_epa:.3f} EPA")
-        
+        if _info:
+            logger.info(f"Home field advantage: +{home_field_epa:.3f} EPA")
+
         # Altitude advantage (Denver)
-        if home_team in TeamsConfig.ALTITUDE_TEAMS:
+        if home_team in _ALTITUDE_TEAMS:
             altitude_boost = BettingConfig.ALTITUDE_ADVANTAGE_EPA
-            home_total_epa += altitude_boost
+            deltas.append((altitude_boost, 0.0))
             adjustments['altitude'] = altitude_boost
-            logger.info(f"Altitude advantage: +{altitude_boost:.3f} EPA")
-        
+            if _info:
+                logger.info(f"Altitude advantage: +{altitude_boost:.3f} EPA")
+
         # Fan noise (home boost)
         raw_fan_noise = compute_fan_noise_boost(home_team)
-        fan_noise = min(raw_fan_noise, EPAConfig.CAP_FAN_NOISE_EPA)
-        home_total_epa += fan_noise
+        fan_noise = min(raw_fan_noise, cap_fan)
+        deltas.append((fan_noise, 0.0))
         adjustments['fan_noise'] = fan_noise
-        logger.info(f"Fan noise boost: +{fan_noise:.3f} EPA (raw {raw_fan_noise:+.3f})")
-        
+        if _info:
+            logger.info(f"Fan noise boost: +{fan_noise:.3f} EPA (raw {raw_fan_noise:+.3f})")
+
         # Travel penalty (applies to away team)
         away_rest = rest_days.get('away', None) if rest_days else None
         travel_pen = compute_travel_penalty(home_team, away_team, away_rest)
         if travel_pen != 0:
             applied_travel = travel_pen if travel_pen >= 0 else max(travel_pen, TravelConfig.MAX_PENALTY_EPA)
-            away_total_epa += applied_travel
+            deltas.append((0.0, applied_travel))
             adjustments['travel_penalty'] = applied_travel
-            logger.info(f"Travel penalty (away): {applied_travel:+.3f} EPA (raw {travel_pen:+.3f})")
-        
-        # Division rivalry compression
+            if _info:
+                logger.info(f"Travel penalty (away): {applied_travel:+.3f} EPA (raw {travel_pen:+.3f})")
+
+        # Division rivalry compression — needs the running differential
+        # at this point, reconstructed from the deltas collected so far
         is_division = are_division_rivals(home_team, away_team)
         if is_division:
-            raw_diff = home_total_epa - away_total_epa
+            raw_diff = base_epa_diff + sum(h - a for h, a in deltas)
             adjusted_diff = self.epa_analyzer.apply_division_rivalry(raw_diff, True)
             compression = raw_diff - adjusted_diff
-            home_total_epa -= compression / 2
-            away_total_epa += compression / 2
+            deltas.append((-compression / 2, compression / 2))
             adjustments['division_rivalry'] = -compression
-            logger.info(f"Division rivalry: {BettingConfig.DIVISION_RIVALRY_COMPRESSION:.0%} compression")
-        
+            if _info:
+                logger.info(f"Division rivalry: {BettingConfig.DIVISION_RIVALRY_COMPRESSION:.0%} compression")
+
         # Rest differential
         if rest_days:
             rest_diff = rest_days.get('home', 0) - rest_days.get('away', 0)
@@ -158,63 +182,66 @@ class NFLPredictor:
                 rest_adjustment = rest_diff * 0.005  # 0.5% per day
                 # Cap
                 if rest_adjustment > 0:
-                    rest_adjustment = min(rest_adjustment, EPAConfig.CAP_REST_EPA)
+                    rest_adjustment = min(rest_adjustment, cap_rest)
                 else:
-                    rest_adjustment = max(rest_adjustment, -EPAConfig.CAP_REST_EPA)
-                home_total_epa += rest_adjustment
+                    rest_adjustment = max(rest_adjustment, -cap_rest)
+                deltas.append((rest_adjustment, 0.0))
                 adjustments['rest_differential'] = rest_adjustment
-                logger.info(f"Rest differential: {rest_diff} days → {rest_adjustment:+.3f} EPA")
-        
+                if _info:
+                    logger.info(f"Rest differential: {rest_diff} days → {rest_adjustment:+.3f} EPA")
+
         # Injuries
         injury_impact = 0.0
         if injuries:
             if home_team in injuries:
                 home_injury_impact = injuries[home_team]
                 # Cap per-team
-                home_injury_impact = max(min(home_injury_impact, EPAConfig.CAP_INJURY_PER_TEAM_EPA), -EPAConfig.CAP_INJURY_PER_TEAM_EPA)
-                home_total_epa += home_injury_impact
+                home_injury_impact = max(min(home_injury_impact, cap_injury), -cap_injury)
+                deltas.append((home_injury_impact, 0.0))
                 injury_impact += home_injury_impact
-                logger.info(f"{home_team} injuries: {home_injury_impact:+.3f} EPA (capped)")
-            
+                if _info:
+                    logger.info(f"{home_team} injuries: {home_injury_impact:+.3f} EPA (capped)")
+
             if away_team in injuries:
                 away_injury_impact = injuries[away_team]
-                away_injury_impact = max(min(away_injury_impact, EPAConfig.CAP_INJURY_PER_TEAM_EPA), -EPAConfig.CAP_INJURY_PER_TEAM_EPA)
-                away_total_epa += away_injury_impact
+                away_injury_impact = max(min(away_injury_impact, cap_injury), -cap_injury)
+                deltas.append((0.0, away_injury_impact))
                 injury_impact += away_injury_impact
-                logger.info(f"{away_team} injuries: {away_injury_impact:+.3f} EPA (capped)")
-        
+                if _info:
+                    logger.info(f"{away_team} injuries: {away_injury_impact:+.3f} EPA (capped)")
+
         adjustments['injuries'] = injury_impact
-        
+
         # Weather (cold, wind, rain/snow)
         weather_impact = 0.0
         if weather:
             temp = weather.get('temperature', 70)
             wind = weather.get('wind_speed', 0)
             precip = weather.get('precipitation', 0)
-            
+
             # Cold weather slightly favors defense
             if temp < 32:
                 weather_impact -= 0.01
-            
+
             # Wind impacts passing game
             if wind > 15:
                 weather_impact -= 0.015
-            
+
             # Precipitation
             if precip > 0:
                 weather_impact -= 0.01
-            
+
             if weather_impact != 0:
                 # Cap overall abs impact
                 if weather_impact > 0:
-                    weather_impact = min(weather_impact, EPAConfig.CAP_WEATHER_EPA)
+                    weather_impact = min(weather_impact, cap_weather)
                 else:
-                    weather_impact = max(weather_impact, -EPAConfig.CAP_WEATHER_EPA)
-                home_total_epa += weather_impact / 2
-                away_total_epa += weather_impact / 2
+                    weather_impact = max(weather_impact, -cap_weather)
+                deltas.append((weather_impact / 2, weather_impact / 2))
                 adjustments['weather'] = weather_impact
-                logger.info(f"Weather impact: {weather_impact:+.3f} EPA (split)")
-        
+                if _info:
+                    logger.info(f"Weather impact: {weather_impact:+.3f} EPA (split)")
+
         # Advanced matchup/context deltas (tiny, bounded)
         adv = aggregate_advanced(home_team, away_team,
                                  home_off, home_def, away_off, away_def,
@@ -222,47 +249,54 @@ class NFLPredictor:
                                  pbp[(pbp['posteam']==away_team)|(pbp['defteam']==away_team)],
                                  weather)
         if AdvancedWeights.ENABLED:
-            home_total_epa += adv['home']
-            away_total_epa += adv['away']
+            deltas.append((adv['home'], adv['away']))
             adjustments['advanced_matchups'] = adv
-        
+
         # Kicker differential
         kicker_impact = 0.0
         kicker_breakdown = {}
         try:
             from core.kicker_analytics import calculate_kicker_stats, calculate_kicker_advantage
-            
+
             home_kicker_stats = calculate_kicker_stats(pbp, home_team)
             away_kicker_stats = calculate_kicker_stats(pbp, away_team)
-            
+
             kicker_epa, kicker_breakdown = calculate_kicker_advantage(
                 home_kicker_stats,
                 away_kicker_stats,
                 weather=weather,
                 is_playoff=is_playoff
             )
-            
-            home_total_epa += kicker_epa
+
+            deltas.append((kicker_epa, 0.0))
             kicker_impact = kicker_epa
             adjustments['kicker'] = kicker_epa
-            
-            if abs(kicker_epa) > 0.005:
+
+            if _info and abs(kicker_epa) > 0.005:
                 logger.info(f"Kicker advantage: {kicker_epa:+.3f} EPA ({home_team if kicker_epa > 0 else away_team})")
         except Exception as e:
             logger.debug(f"Kicker analysis skipped: {e}")
 
+        # Apply all adjustments at once
+        home_adj = sum(h for h, _ in deltas)
+        away_adj = sum(a for _, a in deltas)
+        home_total_epa = home_comb_total + home_adj
+        away_total_epa = away_comb_total + away_adj
+
         # Calculate final EPA differential
         raw_epa_differential = home_total_epa - away_total_epa
 
-        # EPA-dominant global cap on non-EPA adjustments
+        # EPA-dominant global cap on non-EPA adjustments — the net
+        # adjustment effect falls straight out of the delta sums
         if EPAConfig.EPA_DOMINANT_MODE:
-            non_epa_effect = raw_epa_differential - base_epa_diff
+            non_epa_effect = home_adj - away_adj
             cap = EPAConfig.GLOBAL_NON_EPA_CAP
             if abs(non_epa_effect) > cap:
                 clamped_effect = cap if non_epa_effect > 0 else -cap
                 epa_differential = base_epa_diff + clamped_effect
                 adjustments['global_non_epa_cap_applied'] = float(non_epa_effect - clamped_effect)
-                logger.info(f"Global non-EPA cap applied: adjusted by {non_epa_effect - clamped_effect:+.3f} EPA")
+                if _info:
+                    logger.info(f"Global non-EPA cap applied: adjusted by {non_epa_effect - clamped_effect:+.3f} EPA")
             else:
                 epa_differential = raw_epa_differential
                 adjustments['global_non_epa_cap_applied'] = 0.0
@@ -279,12 +313,11 @@ class NFLPredictor:
         else:
             epa_differential = raw_epa_differential
         
-        # Convert EPA to point spread using calibrated scale
+        # Convert EPA to spread and win probability — math.exp on the
+        # scalar path; batch callers use epa_to_spread_and_prob
         predicted_spread = epa_differential / CalibrationConfig.EPA_TO_POINTS
-        
-        # Convert spread to win probability using calibrated logistic
-        win_probability = 1 / (1 + np.exp(-(CalibrationConfig.LOGIT_SLOPE * predicted_spread + CalibrationConfig.LOGIT_INTERCEPT)))
-        
+        win_probability = 1 / (1 + math.exp(-(CalibrationConfig.LOGIT_SLOPE * predicted_spread + CalibrationConfig.LOGIT_INTERCEPT)))
+
         # Determine winner
         if predicted_spread > 0:
             predicted_winner = home_team
@@ -293,9 +326,10 @@ class NFLPredictor:
             predicted_winner = away_team
             confidence = "HIGH" if abs(predicted_spread) > 7 else "MEDIUM" if abs(predicted_spread) > 3 else "LOW"
         
-        logger.info(f"\nPrediction: {predicted_winner} by {abs(predicted_spread):.1f}")
-        logger.info(f"Win probability: {win_probability:.1%}")
-        logger.info(f"Confidence: {confidence}")
+        if _info:
+            logger.info(f"\nPrediction: {predicted_winner} by {abs(predicted_spread):.1f}")
+            logger.info(f"Win probability: {win_probability:.1%}")
+            logger.info(f"Confidence: {confidence}")
         
         # Betting analysis
         betting_rec = self.betting_analyzer.calculate_betting_recommendation(
@@ -350,6 +384,26 @@ class NFLPredictor:
         
         return prediction
     
+    @staticmethod
+    def epa_to_spread_and_prob(epa_differential) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized EPA differential → (spread, win probability).
+
+        Same calibrated scale and logistic as predict_game, applied to
+        a whole array at once — batch consumers (backtests, simulated
+        slates) convert N differentials with one np.exp call instead of
+        N scalar ones.
+
+        Args:
+            epa_differential: Scalar or array of EPA differentials
+
+        Returns:
+            Tuple of (predicted spreads, win probabilities)
+        """
+        spread = np.asarray(epa_differential, dtype=np.float64) / CalibrationConfig.EPA_TO_POINTS
+        win_prob = 1.0 / (1.0 + np.exp(-(CalibrationConfig.LOGIT_SLOPE * spread + CalibrationConfig.LOGIT_INTERCEPT)))
+        return spread, win_prob
+
     def format_prediction_output(self, prediction: Dict) -> str:
         """Format prediction for display."""
         lines = [
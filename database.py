@@ -9,8 +9,10 @@ Provides SQLite-backed persistence for:
 """
 
 import sqlite3
+import threading
+from dataclasses import astuple, dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from contextlib import contextmanager
 
 from config import DatabaseConfig
@@ -18,6 +20,86 @@ from logger import get_logger
 
 logger = get_logger(__name__)
 
+# Insert statements shared by the single-row and bulk paths
+_INSERT_PREDICTION_SQL = '''
+    INSERT INTO predictions (
+        game_date, home_team, away_team, predicted_winner,
+        win_probability, predicted_spread, predicted_total,
+        confidence_level, epa_differential, home_epa, away_epa,
+        injury_impact, weather_impact, sharp_money_indicator
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_INSERT_RESULT_SQL = '''
+    INSERT INTO results (
+        prediction_id, actual_winner, home_score, away_score,
+        actual_margin, actual_total, opening_spread, closing_spread,
+        clv, bet_result, bet_profit
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+@dataclass(slots=True)
+class PredictionRow:
+    """
+    Prediction record for the bulk insert path.
+
+    Field order mirrors _INSERT_PREDICTION_SQL, so astuple() yields
+    the parameter tuple directly — no per-field dict hashing for
+    importers that build rows in bulk.
+    """
+    game_date: Optional[str]
+    home_team: str
+    away_team: str
+    predicted_winner: str
+    win_probability: float
+    predicted_spread: float
+    predicted_total: Optional[float] = None
+    confidence_level: Optional[str] = None
+    epa_differential: Optional[float] = None
+    home_epa: Optional[float] = None
+    away_epa: Optional[float] = None
+    injury_impact: float = 0.0
+    weather_impact: float = 0.0
+    sharp_money_indicator: str = 'NEUTRAL'
+
+
+def _prediction_params(prediction: Dict) -> Tuple:
+    """Parameter tuple for _INSERT_PREDICTION_SQL."""
+    return (
+        prediction.get('game_date'),
+        prediction['home_team'],
+        prediction['away_team'],
+        prediction['predicted_winner'],
+        prediction['win_probability'],
+        prediction['predicted_spread'],
+        prediction.get('predicted_total'),
+        prediction.get('confidence_level'),
+        prediction.get('epa_differential'),
+        prediction.get('home_epa'),
+        prediction.get('away_epa'),
+        prediction.get('injury_impact', 0.0),
+        prediction.get('weather_impact', 0.0),
+        prediction.get('sharp_money_indicator', 'NEUTRAL')
+    )
+
+
+def _result_params(prediction_id: int, result: Dict) -> Tuple:
+    """Parameter tuple for _INSERT_RESULT_SQL."""
+    return (
+        prediction_id,
+        result['actual_winner'],
+        result['home_score'],
+        result['away_score'],
+        result['actual_margin'],
+        result['actual_total'],
+        result.get('opening_spread'),
+        result.get('closing_spread'),
+        result.get('clv'),
+        result.get('bet_result'),
+        result.get('bet_profit')
+    )
+
 
 class PredictionsDB:
     """SQLite database for tracking NFL predictions and performance."""
@@ -30,14 +112,50 @@ class PredictionsDB:
             db_path: Path to SQLite database file (default from config)
         """
         self.db_path = db_path or DatabaseConfig.DB_PATH
+
+        # One connection per thread, opened lazily and reused — a
+        # fresh sqlite3.connect per query costs milliseconds and
+        # starts with a cold page cache. The weekly card's worker
+        # threads each get their own connection; WAL (set below) lets
+        # them read while one writes.
+        self._local = threading.local()
+        self._all_conns = []
+        self._conns_lock = threading.Lock()
+
         self.init_database()
         logger.info(f"Database initialized at {self.db_path}")
-    
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        """Connection for the current thread, created on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # check_same_thread=False only so close_all can close
+            # connections owned by finished threads; each connection
+            # is still used by exactly one thread. The statement cache
+            # keeps the handful of hot INSERT/SELECT strings compiled
+            # across the connection's lifetime, which matters now that
+            # connections are long-lived.
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   cached_statements=128)
+            conn.row_factory = sqlite3.Row
+            # Session pragmas: WAL (set once in init_database) makes
+            # synchronous=NORMAL crash-safe with one fsync per commit
+            # instead of two; the rest keep temp structures and the
+            # page cache in memory. These do not persist, so apply
+            # once per connection.
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            conn.execute('PRAGMA cache_size=-64000')
+            conn.execute('PRAGMA mmap_size=268435456')
+            self._local.conn = conn
+            with self._conns_lock:
+                self._all_conns.append(conn)
+        return conn
+
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Context manager yielding the thread's pooled connection."""
+        conn = self._thread_connection()
         try:
             yield conn
             conn.commit()
@@ -45,14 +163,57 @@ class PredictionsDB:
             conn.rollback()
             logger.error(f"Database error: {e}")
             raise
+
+    @contextmanager
+    def bulk_load(self):
+        """
+        Context manager for high-throughput batch loads.
+
+        Turns off WAL auto-checkpointing for the duration so a large
+        insert stream is not stalled by mid-load checkpoints, wraps
+        the body in a single immediate transaction, then checkpoints
+        (truncating the WAL file) and restores the default cadence on
+        the way out. Intended for migration/backfill scripts:
+
+            with db.bulk_load() as conn:
+                conn.executemany(sql, rows)
+        """
+        conn = self._thread_connection()
+        conn.execute('PRAGMA wal_autocheckpoint=0')
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Database error during bulk load: {e}")
+            raise
         finally:
-            conn.close()
-    
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            conn.execute('PRAGMA wal_autocheckpoint=1000')
+
+    def close_all(self):
+        """Close every pooled connection (shutdown hook)."""
+        with self._conns_lock:
+            for conn in self._all_conns:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._all_conns.clear()
+        self._local = threading.local()
+
+
     def init_database(self):
         """Create database tables if they don't exist."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            
+
+            # Write-ahead logging persists in the database header, so
+            # one statement here covers every future connection; it
+            # also lets readers run concurrently with the writer
+            cursor.execute('PRAGMA journal_mode=WAL')
+
             # Predictions table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS predictions (
@@ -136,10 +297,22 @@ class PredictionsDB:
                 ON predictions(home_team, away_team)
             ''')
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_results_prediction 
+                CREATE INDEX IF NOT EXISTS idx_results_prediction
                 ON results(prediction_id)
             ''')
-            
+
+            # Covering indexes for the performance-stats join: every
+            # column the query touches lives in the index, so SQLite
+            # answers it without visiting the table rows
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_predictions_date_cover
+                ON predictions(game_date, id, predicted_winner)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_results_join_cover
+                ON results(prediction_id, actual_winner, clv, bet_result, bet_profit)
+            ''')
+
             logger.info("Database schema created/verified")
     
     def save_prediction(self, prediction: Dict) -> int:
@@ -154,35 +327,40 @@ class PredictionsDB:
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO predictions (
-                    game_date, home_team, away_team, predicted_winner,
-                    win_probability, predicted_spread, predicted_total,
-                    confidence_level, epa_differential, home_epa, away_epa,
-                    injury_impact, weather_impact, sharp_money_indicator
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                prediction.get('game_date'),
-                prediction['home_team'],
-                prediction['away_team'],
-                prediction['predicted_winner'],
-                prediction['win_probability'],
-                prediction['predicted_spread'],
-                prediction.get('predicted_total'),
-                prediction.get('confidence_level'),
-                prediction.get('epa_differential'),
-                prediction.get('home_epa'),
-                prediction.get('away_epa'),
-                prediction.get('injury_impact', 0.0),
-                prediction.get('weather_impact', 0.0),
-                prediction.get('sharp_money_indicator', 'NEUTRAL')
-            ))
-            
+            cursor.execute(_INSERT_PREDICTION_SQL, _prediction_params(prediction))
+
             prediction_id = cursor.lastrowid
             logger.info(f"Saved prediction {prediction_id}: {prediction['away_team']} @ {prediction['home_team']}")
             return prediction_id
-    
+
+    def save_predictions_bulk(self, predictions: List[Union[Dict, PredictionRow]]) -> int:
+        """
+        Save many predictions in one transaction.
+
+        executemany inside a single commit pays the journal fsync once
+        for the whole batch instead of once per row — the difference
+        between ~60 inserts/s and tens of thousands for backfills.
+        PredictionRow entries skip the dict lookups entirely (astuple
+        is a C-level tuple build over the slots layout).
+
+        Args:
+            predictions: List of prediction dicts or PredictionRow records
+
+        Returns:
+            Number of predictions inserted
+        """
+        if not predictions:
+            return 0
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                _INSERT_PREDICTION_SQL,
+                (astuple(p) if isinstance(p, PredictionRow) else _prediction_params(p)
+                 for p in predictions))
+            logger.info(f"Saved {len(predictions)} predictions in bulk")
+            return len(predictions)
+
     def save_result(self, prediction_id: int, result: Dict) -> int:
         """
         Save actual game result.
@@ -196,31 +374,33 @@ class PredictionsDB:
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO results (
-                    prediction_id, actual_winner, home_score, away_score,
-                    actual_margin, actual_total, opening_spread, closing_spread,
-                    clv, bet_result, bet_profit
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                prediction_id,
-                result['actual_winner'],
-                result['home_score'],
-                result['away_score'],
-                result['actual_margin'],
-                result['actual_total'],
-                result.get('opening_spread'),
-                result.get('closing_spread'),
-                result.get('clv'),
-                result.get('bet_result'),
-                result.get('bet_profit')
-            ))
-            
+            cursor.execute(_INSERT_RESULT_SQL, _result_params(prediction_id, result))
+
             result_id = cursor.lastrowid
             logger.info(f"Saved result {result_id} for prediction {prediction_id}")
             return result_id
-    
+
+    def save_results_bulk(self, results: List[Tuple[int, Dict]]) -> int:
+        """
+        Save many game results in one transaction.
+
+        Args:
+            results: List of (prediction_id, result dict) pairs
+
+        Returns:
+            Number of results inserted
+        """
+        if not results:
+            return 0
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(_INSERT_RESULT_SQL,
+                               (_result_params(pid, r) for pid, r in results))
+            logger.info(f"Saved {len(results)} results in bulk")
+            return len(results)
+
+
     def get_performance_stats(self, days: int = 30) -> Dict:
         """
         Calculate performance statistics.
@@ -233,20 +413,26 @@ class PredictionsDB:
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Get predictions with results
+
+            # Aggregate inside SQLite — one summary row crosses the
+            # boundary instead of every joined row, and the planner
+            # can drive the join from idx_results_prediction
             cursor.execute('''
-                SELECT 
-                    p.predicted_winner, p.predicted_spread, p.win_probability,
-                    r.actual_winner, r.actual_margin, r.clv, r.bet_result, r.bet_profit
+                SELECT
+                    COUNT(*) AS total,
+                    SUM(CASE WHEN p.predicted_winner = r.actual_winner THEN 1 ELSE 0 END) AS correct_su,
+                    SUM(CASE WHEN r.bet_result = 'WIN' THEN 1 ELSE 0 END) AS correct_ats,
+                    AVG(COALESCE(r.clv, 0)) AS avg_clv,
+                    SUM(COALESCE(r.bet_profit, 0)) AS total_profit
                 FROM predictions p
                 JOIN results r ON p.id = r.prediction_id
-                WHERE p.game_date >= datetime('now', '-' || ? || ' days')
-            ''', (days,))
-            
-            rows = cursor.fetchall()
-            
-            if not rows:
+                WHERE p.game_date >= datetime('now', ?)
+            ''', (f'-{days} days',))
+
+            row = cursor.fetchone()
+            total = row['total']
+
+            if not total:
                 return {
                     'total_predictions': 0,
                     'accuracy_su': 0.0,
@@ -255,13 +441,12 @@ class PredictionsDB:
                     'total_profit': 0.0,
                     'roi': 0.0
                 }
-            
-            total = len(rows)
-            correct_su = sum(1 for r in rows if r['predicted_winner'] == r['actual_winner'])
-            correct_ats = sum(1 for r in rows if r['bet_result'] == 'WIN')
-            avg_clv = sum(r['clv'] or 0 for r in rows) / total
-            total_profit = sum(r['bet_profit'] or 0 for r in rows)
-            
+
+            correct_su = row['correct_su']
+            correct_ats = row['correct_ats']
+            avg_clv = row['avg_clv']
+            total_profit = row['total_profit']
+
             return {
                 'total_predictions': total,
                 'accuracy_su': correct_su / total if total > 0 else 0.0,
@@ -271,31 +456,36 @@ class PredictionsDB:
                 'roi': (total_profit / (total * 100)) if total > 0 else 0.0  # Assuming $100 avg bet
             }
     
-    def get_recent_predictions(self, limit: int = 10) -> List[Dict]:
+    def get_recent_predictions(self, limit: int = 10) -> Iterator[Dict]:
         """
         Get recent predictions with results.
-        
+
+        Rows are yielded as they come off the cursor instead of being
+        materialized twice (Row objects plus a dict list) — streaming
+        consumers start emitting before the query finishes, and
+        callers that want a list can wrap in list().
+
         Args:
             limit: Maximum number of predictions to return
-            
-        Returns:
-            List of prediction dictionaries
+
+        Yields:
+            Prediction dictionaries, most recent first
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            
+
             cursor.execute('''
-                SELECT 
-                    p.*, r.actual_winner, r.home_score, r.away_score, 
+                SELECT
+                    p.*, r.actual_winner, r.home_score, r.away_score,
                     r.clv, r.bet_result
                 FROM predictions p
                 LEFT JOIN results r ON p.id = r.prediction_id
                 ORDER BY p.game_date DESC
                 LIMIT ?
             ''', (limit,))
-            
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+
+            for row in cursor:
+                yield dict(row)
     
     def calculate_clv(self, prediction_id: int, closing_spread: float) -> Optional[float]:
         """
@@ -6,25 +6,33 @@ from logger import get_logger
 
 logger = get_logger(__name__)
 
+# Decimal-odds memo: real odds come from a tiny set (-110, -105, +100,
+# ...), so each conversion is computed once and reused
+_DEC_ODDS: Dict[int, float] = {}
+
 
 class KellyCalculator:
     """Calculate optimal bet sizes using Kelly Criterion."""
-    
+
     @staticmethod
     def american_to_decimal(odds: int) -> float:
         """
-        Convert American odds to decimal odds.
-        
+        Convert American odds to decimal odds (memoized).
+
         Args:
             odds: American odds (e.g., -110, +150)
-            
+
         Returns:
             Decimal odds
         """
-        if odds > 0:
-            return (odds / 100) + 1
-        else:
-            return (100 / abs(odds)) + 1
+        dec = _DEC_ODDS.get(odds)
+        if dec is None:
+            if odds > 0:
+                dec = (odds / 100) + 1
+            else:
+                dec = (100 / abs(odds)) + 1
+            _DEC_ODDS[odds] = dec
+        return dec
     
     @staticmethod
     def calculate_implied_prob(odds: int) -> float:
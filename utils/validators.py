@@ -2,6 +2,17 @@
 
 from config import TeamsConfig
 
+# Precomputed membership sets: the division structure is static, so
+# rivalry checks become one O(1) pair lookup instead of walking the
+# eight division lists per call
+_DIVISION_PAIRS = frozenset(
+    (a, b)
+    for division_teams in TeamsConfig.DIVISIONS.values()
+    for a in division_teams
+    for b in division_teams
+    if a != b
+)
+
 
 def validate_team(team: str) -> bool:
     """
@@ -77,11 +88,5 @@ def are_division_rivals(team1: str, team2: str) -> bool:
     """
     validate_team(team1)
     validate_team(team2)
-    
-    divisions = TeamsConfig.DIVISIONS
-    
-    for division_teams in divisions.values():
-        if team1 in division_teams and team2 in division_teams:
-            return True
-    
-    return False
+
+    return (team1, team2) in _DIVISION_PAIRS
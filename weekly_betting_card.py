@@ -2,7 +2,9 @@
 Weekly Betting Card Generator
 Run this script each week to get betting recommendations based on current market lines.
 """
-from core.betting_signals import BettingSignalGenerator
+from concurrent.futures import ThreadPoolExecutor
+
+from core.betting_signals import BettingSignalGenerator, BetSignal
 from core.predictor import NFLPredictor
 from core.data_loader import NFLDataLoader
 from config import BettingConfig
@@ -89,23 +91,29 @@ def generate_weekly_card():
     predictor = NFLPredictor()
     
     print("Running predictions...\n")
-    predictions = []
-    
+
     # Load weather forecasts
     weather_forecasts = get_weather_forecasts()
     
+    # Resolve weather up front (keeps the log output ordered), then run
+    # the per-game predictions concurrently — each predict_game spends
+    # most of its time waiting on data access, so a small thread pool
+    # overlaps that instead of serializing 16 games end-to-end
+    game_weather = []
     for game in games:
         game_key = f"{game['away']} @ {game['home']}"
         print(f"Analyzing {game_key}...")
-        
-        # Get weather for this specific game
+
         weather = weather_forecasts.get(game_key)
         if weather is None:
             print(f"  ⚠️  No weather forecast found for {game_key}, using defaults")
             weather = {'temperature': 50, 'wind_speed': 5, 'precipitation': 0}
         else:
             print(f"  🌤  Weather: {weather['temperature']}°F, Wind: {weather['wind_speed']}mph")
-        
+        game_weather.append(weather)
+
+    def _predict(game_and_weather):
+        game, weather = game_and_weather
         pred = predictor.predict_game(
             home_team=game['home'],
             away_team=game['away'],
@@ -114,11 +122,17 @@ def generate_weekly_card():
             is_playoff=True,  # Divisional Round
             save_to_db=False  # Don't clutter DB during testing
         )
-        
         # Add game date to prediction for CSV export
         pred['game_date'] = game.get('date', 'TBD')
-        
-        predictions.append(pred)
+        return pred
+
+    # Warm the shared loader once before fanning out — on a cold cache
+    # every worker would otherwise race the first pbp load (duplicate
+    # downloads and non-atomic writes to the same cache file)
+    predictor.data_loader.load_play_by_play()
+
+    with ThreadPoolExecutor(max_workers=min(8, len(games))) as executor:
+        predictions = list(executor.map(_predict, zip(games, game_weather)))
     
     # Get current market lines
     market_lines = get_divisional_round_lines()
@@ -158,7 +172,7 @@ def export_to_csv(recommendations):
             'analysis_date': datetime.now().strftime('%Y-%m-%d'),
             'game_date': game_date,
             'game': rec.game,
-            'signal': rec.signal.value,
+            'signal': rec.signal.label,
             'recommended_side': rec.recommended_side,
             'model_spread': rec.model_spread,
             'market_spread': rec.market_spread,
@@ -206,7 +220,7 @@ if __name__ == "__main__":
     print("🔥 QUICK REFERENCE: STRONG BETS ONLY")
     print("="*80)
     
-    strong_bets = [r for r in recommendations if r.signal.value == "STRONG BET"]
+    strong_bets = [r for r in recommendations if r.signal == BetSignal.STRONG_BET]
     
     if strong_bets:
         for rec in strong_bets: